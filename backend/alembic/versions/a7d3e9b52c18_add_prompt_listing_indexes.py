@@ -0,0 +1,52 @@
+"""add_prompt_listing_indexes
+
+Revision ID: a7d3e9b52c18
+Revises: f2c6a8d41b97
+Create Date: 2026-10-18 14:21:37.208954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b52c18'
+down_revision: Union[str, None] = 'f2c6a8d41b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Listings only ever show active prompts and order by (sort column, id), so
+# partial indexes on active rows serve both the filter and the sort (scanned
+# backwards for descending order) without touching inactive prompts.
+INDEXES = (
+    ('ix_prompt_active_category_created_at', ['category_id', 'created_at', 'id']),
+    ('ix_prompt_active_created_at', ['created_at', 'id']),
+    ('ix_prompt_active_price', ['price', 'id']),
+    ('ix_prompt_active_rating', ['rating', 'id']),
+    ('ix_prompt_active_sales_count', ['sales_count', 'id']),
+    ('ix_prompt_active_views_count', ['views_count', 'id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                'prompt',
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text('is_active'),
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='prompt', if_exists=True, postgresql_concurrently=True)
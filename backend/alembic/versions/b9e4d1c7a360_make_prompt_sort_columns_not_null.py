@@ -0,0 +1,50 @@
+"""make_prompt_sort_columns_not_null
+
+Revision ID: b9e4d1c7a360
+Revises: a7d3e9b52c18
+Create Date: 2026-10-18 16:32:08.415227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4d1c7a360'
+down_revision: Union[str, None] = 'a7d3e9b52c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Listing sort columns that default to zero. A keyset seek compares (column, id)
+# row values, and a comparison against NULL is never true, so a page ending on
+# a NULL row would have no next page.
+COUNTER_COLUMNS = (
+    ('views_count', sa.Integer()),
+    ('sales_count', sa.Integer()),
+    ('rating', sa.Float()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, type_ in COUNTER_COLUMNS:
+        op.execute(f"UPDATE prompt SET {name} = 0 WHERE {name} IS NULL")
+        op.alter_column('prompt', name, existing_type=type_, nullable=False, server_default='0')
+
+    op.execute("UPDATE prompt SET created_at = coalesce(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    op.alter_column(
+        'prompt', 'created_at',
+        existing_type=sa.DateTime(), existing_server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'prompt', 'created_at',
+        existing_type=sa.DateTime(), existing_server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True,
+    )
+    for name, type_ in reversed(COUNTER_COLUMNS):
+        op.alter_column('prompt', name, existing_type=type_, nullable=True, server_default=None)
@@ -0,0 +1,54 @@
+"""add_prompt_search_vector
+
+Revision ID: c1deb31a12ef
+Revises: 0471dbcd48ef
+Create Date: 2026-10-18 09:12:41.502113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1deb31a12ef'
+down_revision: Union[str, None] = '0471dbcd48ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.models.prompt.SEARCH_VECTOR_EXPRESSION at the time of this revision
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a STORED generated column rewrites the table, which backfills
+    # the vector for every existing prompt in the same statement.
+    op.add_column(
+        'prompt',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_prompt_search_vector',
+        'prompt',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_prompt_search_vector', table_name='prompt', postgresql_using='gin')
+    op.drop_column('prompt', 'search_vector')
@@ -0,0 +1,45 @@
+"""add_category_prompts_count
+
+Revision ID: d4a7f2c9e1b3
+Revises: c1deb31a12ef
+Create Date: 2026-10-18 11:02:17.348920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7f2c9e1b3'
+down_revision: Union[str, None] = 'c1deb31a12ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'category',
+        sa.Column('prompts_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    # Backfill with active prompts only, matching what the prompt service maintains
+    op.execute(
+        """
+        UPDATE category
+        SET prompts_count = counts.n
+        FROM (
+            SELECT category_id, count(*) AS n
+            FROM prompt
+            WHERE is_active
+            GROUP BY category_id
+        ) AS counts
+        WHERE category.id = counts.category_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('category', 'prompts_count')
@@ -0,0 +1,72 @@
+"""add_prompt_rating_aggregates
+
+Revision ID: e8b3c5a1f702
+Revises: d4a7f2c9e1b3
+Create Date: 2026-10-18 11:48:53.019274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3c5a1f702'
+down_revision: Union[str, None] = 'd4a7f2c9e1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGGREGATE_COLUMNS = (
+    ('rating_sum', sa.Float()),
+    ('rating_count', sa.Integer()),
+    ('rating_1_count', sa.Integer()),
+    ('rating_2_count', sa.Integer()),
+    ('rating_3_count', sa.Integer()),
+    ('rating_4_count', sa.Integer()),
+    ('rating_5_count', sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, type_ in AGGREGATE_COLUMNS:
+        op.add_column('prompt', sa.Column(name, type_, nullable=False, server_default='0'))
+
+    # Backfill from existing reviews; stars are whole ratings rounded down, clamped to 1-5.
+    # updated_at is left alone since the prompts themselves did not change.
+    op.execute(
+        """
+        UPDATE prompt
+        SET rating_sum = agg.rating_sum,
+            rating_count = agg.rating_count,
+            rating = agg.rating_sum / agg.rating_count,
+            rating_1_count = agg.stars_1,
+            rating_2_count = agg.stars_2,
+            rating_3_count = agg.stars_3,
+            rating_4_count = agg.stars_4,
+            rating_5_count = agg.stars_5
+        FROM (
+            SELECT prompt_id,
+                   sum(rating) AS rating_sum,
+                   count(*) AS rating_count,
+                   count(*) FILTER (WHERE star = 1) AS stars_1,
+                   count(*) FILTER (WHERE star = 2) AS stars_2,
+                   count(*) FILTER (WHERE star = 3) AS stars_3,
+                   count(*) FILTER (WHERE star = 4) AS stars_4,
+                   count(*) FILTER (WHERE star = 5) AS stars_5
+            FROM (
+                SELECT prompt_id, rating, least(greatest(floor(rating), 1), 5) AS star
+                FROM review
+            ) AS rated
+            GROUP BY prompt_id
+        ) AS agg
+        WHERE prompt.id = agg.prompt_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _ in reversed(AGGREGATE_COLUMNS):
+        op.drop_column('prompt', name)
@@ -0,0 +1,47 @@
+"""add_relation_lookup_indexes
+
+Revision ID: f2c6a8d41b97
+Revises: e8b3c5a1f702
+Create Date: 2026-10-18 14:05:12.663410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8d41b97'
+down_revision: Union[str, None] = 'e8b3c5a1f702'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) for the per-user and per-prompt lookups in the services
+INDEXES = (
+    ('ix_favorite_user_id_prompt_id', 'favorite', ['user_id', 'prompt_id']),
+    ('ix_favorite_prompt_id', 'favorite', ['prompt_id']),
+    ('ix_order_user_id_prompt_id_status', 'order', ['user_id', 'prompt_id', 'status']),
+    ('ix_order_prompt_id', 'order', ['prompt_id']),
+    ('ix_review_prompt_id', 'review', ['prompt_id']),
+    ('ix_review_user_id_prompt_id', 'review', ['user_id', 'prompt_id']),
+    ('ix_prompt_seller_id', 'prompt', ['seller_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids locking writes on large tables but cannot run inside
+    # a transaction. A failed build leaves an INVALID index behind: drop it and
+    # rerun the upgrade.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
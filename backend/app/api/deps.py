@@ -1,12 +1,14 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Callable, Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.db.session import SessionLocal
+from starlette.concurrency import run_in_threadpool
+from app.db.routing import AsyncReadSessionLocal, ReadSessionLocal, configure_async_read_sessions, primary_pins
+from app.db.session import SessionRunner, get_db
 from app.models.user import User
-from app.services import user as user_service
+from app.services.principal_cache import principal_cache
 
 # Fix typo: OAuth2PassordBearer -> OAuth2PasswordBearer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
@@ -14,13 +16,6 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login
 # Add HTTP Bearer for JSON requests
 http_bearer = HTTPBearer(auto_error=False)
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
 async def get_token_from_header(credentials: Optional[HTTPAuthorizationCredentials] = Depends(http_bearer)) -> Optional[str]:
     """Extract token from Authorization header"""
     if credentials:
@@ -55,7 +50,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = user_service.get_user(db, user_id=int(user_id))
+    user = principal_cache.get_user(db, int(user_id), payload.get("iat"))
     if user is None:
         raise credentials_exception
     return user
@@ -83,10 +78,38 @@ async def get_current_user_optional(
         if user_id is None:
             return None
         
-        user = user_service.get_user(db, user_id=int(user_id))
+        user = principal_cache.get_user(db, int(user_id), payload.get("iat"))
         if user is None or not user.is_active:
             return None
         
         return user
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+
+def session_runner(route: str) -> Callable[..., AsyncGenerator[SessionRunner, None]]:
+    """
+    Dependency factory for read-only routes: a SessionRunner on an AsyncSession
+    when `route` is listed in ASYNC_DB_ROUTES, otherwise on a threadpool Session.
+    Reads go to a replica when configured, unless the viewer wrote recently.
+    """
+    async def dependency(
+        current_user: Optional[User] = Depends(get_current_user_optional),
+    ) -> AsyncGenerator[SessionRunner, None]:
+        use_primary = False
+        if current_user is not None:
+            if primary_pins.shared:
+                use_primary = await run_in_threadpool(primary_pins.is_pinned, current_user.id)
+            else:
+                use_primary = primary_pins.is_pinned(current_user.id)
+        if route in settings.ASYNC_DB_ROUTES:
+            configure_async_read_sessions()
+            async with AsyncReadSessionLocal(use_primary=use_primary) as async_db:
+                yield SessionRunner(async_db=async_db)
+        else:
+            db = ReadSessionLocal(use_primary=use_primary)
+            try:
+                yield SessionRunner(db=db)
+            finally:
+                await run_in_threadpool(db.close)
+    return dependency
@@ -0,0 +1,60 @@
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+
+from app.core.config import settings
+
+
+def etag_for(value: Any) -> str:
+    """Strong ETag: a hash of the JSON representation (keys sorted, so dict order doesn't matter)"""
+    digest = hashlib.blake2b(orjson.dumps(value, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def cache_headers(etag: str, surrogate_keys: Iterable[str], anonymous: bool) -> Dict[str, str]:
+    """
+    Validators plus caching policy. Anonymous catalog responses are public,
+    so a CDN can serve them and purge by surrogate key (the same tags the
+    response cache is invalidated with); personalized ones must be
+    revalidated by the client on every use.
+    """
+    headers = {"ETag": etag, "Vary": "Authorization"}
+    if anonymous:
+        headers["Cache-Control"] = (
+            f"public, max-age={settings.CATALOG_MAX_AGE_SECONDS}, s-maxage={settings.CATALOG_CDN_MAX_AGE_SECONDS}"
+        )
+        headers["Surrogate-Key"] = " ".join(surrogate_keys)
+    else:
+        headers["Cache-Control"] = "private, no-cache"
+    return headers
+
+
+def conditional_response(
+    request: Request, payload: Any, etag: str, surrogate_keys: Iterable[str], anonymous: bool = True,
+) -> Response:
+    """304 Not Modified if the client holds `etag`, otherwise the JSON payload, with cache headers either way"""
+    headers = cache_headers(etag, surrogate_keys, anonymous)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(payload, headers=headers)
+
+
+def cached_entry(payload: Optional[Any]) -> Optional[Dict[str, Any]]:
+    """Response cache entry pairing a payload with its ETag, so 304s need no serialization"""
+    if payload is None:
+        return None
+    return {"etag": etag_for(payload), "payload": payload}
@@ -0,0 +1,273 @@
+import logging
+import time
+import zlib
+from typing import Any, Dict, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.query_stats import end_request, route_query_totals, start_request
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip only without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Label for requests that matched no route (404s), so unknown paths don't create new labels
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# Templates matched before routing, memoized per (method, path)
+_path_templates = TTLCache(max_entries=4096, ttl_seconds=3600)
+
+
+def _match_template(scope: Scope, app: Any) -> str:
+    key = (scope.get("method"), scope["path"])
+    template = _path_templates.get(key)
+    if template is None:
+        template = UNMATCHED_ROUTE
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                template = route.path
+                break
+            if match == Match.PARTIAL and template == UNMATCHED_ROUTE:
+                # Path matched but not the method (405)
+                template = route.path
+        _path_templates.set(key, template)
+    return template
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The path template of the route handling the request (e.g.
+    /api/v1/prompts/{prompt_id}). Starlette 0.36 stores the matched endpoint,
+    not the route, in the scope, so once routed the template is looked up by
+    endpoint; before routing (or for 404/405s) the routes are matched against
+    the path.
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if app is None:
+        return UNMATCHED_ROUTE
+    if endpoint is None:
+        return _match_template(scope, app)
+
+    templates: Optional[Dict[Any, str]] = getattr(app.state, "route_templates", None)
+    if templates is None:
+        templates = {}
+        for route in app.router.routes:
+            if isinstance(route, BaseRoute) and getattr(route, "endpoint", None) is not None:
+                templates.setdefault(route.endpoint, route.path)
+        app.state.route_templates = templates
+    return templates.get(endpoint, UNMATCHED_ROUTE)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts SQL statements and database time per request. In debug mode (or
+    with QUERY_STATS_HEADERS) they are returned as X-DB-* response headers;
+    per-route totals are always kept and exported to Prometheus, and statements repeated
+    QUERY_REPEAT_THRESHOLD times within one request are logged as N+1 suspects.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        headers = settings.QUERY_STATS_HEADERS
+        self.emit_headers = settings.DEBUG if headers is None else headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_request(lambda: route_template(scope))
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.emit_headers:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+                repeated = stats.repeated()
+                if repeated:
+                    headers["X-DB-Repeated-Statements"] = str(len(repeated))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            end_request(token)
+            route = route_template(scope)
+            repeated = stats.repeated()
+            for shape, count in repeated:
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %s",
+                    scope.get("method"), route, count, shape,
+                )
+            route_query_totals.add(route, stats, flagged=bool(repeated))
+            if settings.METRICS_ENABLED:
+                method = scope.get("method")
+                metrics.db_statements_per_request.labels(method, route).observe(stats.count)
+                if repeated:
+                    metrics.db_n_plus_one_requests_total.labels(method, route).inc()
+
+
+class MetricsMiddleware:
+    """
+    Prometheus request count, latency and in-progress metrics per route
+    template. The in-progress gauge needs the template before the request is
+    routed, which route_template resolves by matching the path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = metrics.http_requests_in_progress.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.http_request_duration_seconds.labels(method, route).observe(time.perf_counter() - started)
+            metrics.http_requests_total.labels(method, route, str(status_code)).inc()
+            in_progress.dec()
+            metrics.refresh_runtime_gauges(settings.METRICS_REFRESH_SECONDS)
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31 writes the gzip container rather than raw zlib
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        body = self._compressor.compress(data)
+        return body + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        body = self._compressor.process(data)
+        return body + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Content-codings from an Accept-Encoding header with their q-values"""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Brotli or gzip compression, negotiated from Accept-Encoding q-values
+    (brotli preferred on a tie, when installed). Bodies under `minimum_size`
+    are sent as-is; streamed bodies are flushed chunk by chunk so clients see
+    rows as they are produced. A strong ETag is weakened on compressed
+    responses, since the encoded bytes differ from the identity body.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000, gzip_level: int = 6,
+                 brotli_quality: Optional[int] = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality if brotli is not None else None
+
+    def _encoder(self, scope: Scope):
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        wildcard = accepted.get("*", 0.0)
+        candidates = []
+        if self.brotli_quality is not None:
+            candidates.append((accepted.get("br", wildcard), 1, "br"))
+        candidates.append((accepted.get("gzip", wildcard), 0, "gzip"))
+        q, _, name = max(candidates)
+        if q <= 0:
+            return None
+        if name == "br":
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoder = self._encoder(scope) if scope["type"] == "http" else None
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressing = False
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressing, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if not compressing:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if "content-encoding" in headers or (len(body) < self.minimum_size and not more_body):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                compressing = True
+                headers["Content-Encoding"] = encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                del headers["Content-Length"]
+                body = encoder.compress(body, final=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start_message)
+            else:
+                body = encoder.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
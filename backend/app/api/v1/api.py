@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import prompts, admin, auth, categories, orders, favorites, users, reviews
+from app.api.v1.endpoints import prompts, admin, auth, categories, orders, favorites, users, reviews, exports
 
 api_router = APIRouter()
 
@@ -10,4 +10,5 @@ api_router.include_router(orders.router, prefix="/orders", tags=["orders"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 api_router.include_router(favorites.router, prefix="/favorites", tags=["favorites"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
\ No newline at end of file
+api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
\ No newline at end of file
@@ -4,6 +4,13 @@ from sqlalchemy.orm import Session
 from app.api import deps
 from app.schemas.category import CategoryInDB, CategoryCreate, CategoryUpdate
 from app.services import category as category_service
+from app.core.cache import response_cache
+from app.core.hashing import password_hash_pool
+from app.db.routing import replica_stats
+from app.db.session import pool_stats
+from app.db.query_stats import route_query_totals
+from app.db.slow_queries import slow_query_log
+from app.services.view_counter import view_buffer
 from app.models.user import UserRole
 
 router = APIRouter()
@@ -24,11 +31,7 @@ def list_categories(
             detail="Only admins can access this endpoint"
         )
     
-    categories = category_service.get_categories(db, skip, limit)
-    # Add prompts count to each category
-    for category in categories:
-        category.prompts_count = category_service.get_category_prompts_count(db, category.id)
-    return categories
+    return category_service.get_categories(db, skip, limit)
 
 @router.get("/categories/{category_id}", response_model=CategoryInDB)
 def get_category(
@@ -48,8 +51,6 @@ def get_category(
     category = category_service.get_category(db, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    
-    category.prompts_count = category_service.get_category_prompts_count(db, category_id)
     return category
 
 @router.post("/categories", response_model=CategoryInDB, status_code=status.HTTP_201_CREATED)
@@ -115,4 +116,158 @@ def delete_category(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Category not found"
         )
-    return None 
\ No newline at end of file
+    return None
+
+@router.post("/categories/recount", response_model=dict)
+def recount_category_prompts(
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Recompute the denormalized active prompt count of every category (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return {"categories_updated": category_service.recount_prompts(db)}
+
+@router.get("/view-counter", response_model=dict)
+def get_view_counter_stats(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Get write-behind view counter buffer statistics (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return view_buffer.stats()
+
+@router.get("/db-pool", response_model=dict)
+def get_db_pool_stats(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Get database connection pool and read replica statistics for this worker (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return {**pool_stats(), **replica_stats()}
+
+@router.get("/query-stats", response_model=dict)
+def get_query_stats(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Get per-route SQL statement counts, database time and N+1 flags for this worker (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return route_query_totals.snapshot()
+
+@router.get("/slow-queries", response_model=List[dict])
+def get_slow_queries(
+    limit: int = Query(100, ge=1, le=1000),
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Get the newest slow statements logged by this worker, with sampled plans (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return slow_query_log.recent(limit)
+
+@router.post("/slow-queries/dump", response_model=dict)
+def dump_slow_queries(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Append this worker's slow query log to SLOW_QUERY_DUMP_PATH as JSON lines (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return slow_query_log.dump()
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Clear this worker's slow query log (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    slow_query_log.clear()
+    return None
+
+@router.get("/password-hashing", response_model=dict)
+def get_password_hashing_stats(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Get password hashing pool queue depth and counters (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return password_hash_pool.stats()
+
+@router.get("/cache", response_model=dict)
+def get_cache_stats(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Get response cache statistics (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    return response_cache.stats()
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+def clear_cache(
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Clear the response cache (admin only)
+    """
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can access this endpoint"
+        )
+    
+    response_cache.clear()
+    return None
@@ -1,43 +1,66 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.http_cache import cached_entry, conditional_response
+from app.core.cache import response_cache, CATEGORIES_TAG
+from app.db.session import SessionRunner
 from app.schemas.category import CategoryInDB
 from app.services import category as category_service
 
 router = APIRouter()
 
+def _categories(db: Session, skip: int, limit: int) -> List[dict]:
+    categories = category_service.get_categories(db, skip, limit)
+    return [
+        CategoryInDB.model_validate(category, from_attributes=True).model_dump(mode="json")
+        for category in categories
+    ]
+
+def _category(db: Session, category_id: int) -> Optional[dict]:
+    category = category_service.get_category(db, category_id)
+    if not category:
+        return None
+    return CategoryInDB.model_validate(category, from_attributes=True).model_dump(mode="json")
+
 @router.get("/", response_model=List[CategoryInDB])
-def list_categories(
-    db: Session = Depends(deps.get_db),
+async def list_categories(
+    request: Request,
+    runner: SessionRunner = Depends(deps.session_runner("categories.list")),
     skip: int = 0,
     limit: int = 100,
 ):
     """
     List all active categories with pagination.
     This endpoint is available to all users without authentication.
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified.
     """
-    categories = category_service.get_categories(db, skip, limit)
-    
-    # Add prompts count to each category
-    for category in categories:
-        category.prompts_count = category_service.get_category_prompts_count(db, category.id)
-    
-    return categories
+    cache_key = f"categories:list:{skip}:{limit}"
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        versions = response_cache.tag_versions([CATEGORIES_TAG])
+        entry = cached_entry(await runner.run(_categories, skip, limit))
+        response_cache.set(cache_key, entry, tags=[CATEGORIES_TAG], versions=versions)
+    return conditional_response(request, entry["payload"], entry["etag"], [CATEGORIES_TAG])
 
 
 @router.get("/{category_id}", response_model=CategoryInDB)
-def get_category(
+async def get_category(
     category_id: int,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    runner: SessionRunner = Depends(deps.session_runner("categories.detail")),
 ):
     """
     Get a single category by ID.
     This endpoint is available to all users without authentication.
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified.
     """
-    category = category_service.get_category(db, category_id)
-    if not category:
-        raise HTTPException(status_code=404, detail="Category not found")
-    
-    category.prompts_count = category_service.get_category_prompts_count(db, category_id)
-    return category
\ No newline at end of file
+    cache_key = f"categories:detail:{category_id}"
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        versions = response_cache.tag_versions([CATEGORIES_TAG])
+        entry = cached_entry(await runner.run(_category, category_id))
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+        response_cache.set(cache_key, entry, tags=[CATEGORIES_TAG], versions=versions)
+    return conditional_response(request, entry["payload"], entry["etag"], [CATEGORIES_TAG])
\ No newline at end of file
@@ -0,0 +1,69 @@
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.services import export as export_service
+from app.models.user import UserRole
+
+router = APIRouter()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+def export_response(query: Select, format: str, filename: str) -> StreamingResponse:
+    """Stream the query's rows as they are fetched"""
+    return StreamingResponse(
+        export_service.export_chunks(query, format),
+        media_type=export_service.EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/prompts")
+def export_prompts(
+    db: Session = Depends(deps.get_db),
+    format: ExportFormat = "ndjson",
+    after_id: int = Query(0, ge=0, description="Resume after the last prompt id received"),
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Export the whole active catalog (admins and enterprise subscribers)
+    """
+    if current_user.role != UserRole.ADMIN and not export_service.can_export_catalog(db, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and enterprise subscribers can export the catalog"
+        )
+
+    return export_response(export_service.catalog_query(after_id), format, "prompts")
+
+
+@router.get("/orders")
+def export_seller_orders(
+    format: ExportFormat = "ndjson",
+    after_id: int = Query(0, ge=0, description="Resume after the last order id received"),
+    seller_id: Optional[int] = Query(None, description="Admins only: export another seller's orders"),
+    current_user = Depends(deps.get_current_active_user),
+):
+    """
+    Export the full order history of the current seller's prompts
+    """
+    if current_user.role not in [UserRole.SELLER, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only sellers can export their orders"
+        )
+    if seller_id is not None and seller_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can export another seller's orders"
+        )
+
+    query = export_service.seller_orders_query(seller_id or current_user.id, after_id)
+    return export_response(query, format, "orders")
@@ -1,9 +1,10 @@
-from typing import List
+from typing import List, Union
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api import deps
-from app.schemas.prompt import PromptInDB
+from app.db.session import SessionRunner
+from app.schemas.prompt import PromptInDB, PromptSummary, PromptView
 from app.schemas.favorite import FavoriteCreate, FavoriteResponse
 from app.services import favorite as favorite_service
 from app.services import prompt as prompt_service
@@ -48,18 +49,26 @@ def remove_favorite(
     return {"success": True, "message": "Prompt removed from favorites"}
 
 
-@router.get("/", response_model=List[PromptInDB])
-def get_my_favorites(
-    db: Session = Depends(deps.get_db),
+def _user_favorites(
+    db: Session, user_id: int, skip: int, limit: int, view: PromptView
+) -> List[Union[PromptSummary, PromptInDB]]:
+    favorites = favorite_service.get_user_favorites(db, user_id, skip, limit, view=view)
+    item_schema = PromptInDB if view == "full" else PromptSummary
+    return [item_schema.model_validate(prompt) for prompt in favorites]
+
+
+@router.get("/", response_model=List[Union[PromptSummary, PromptInDB]])
+async def get_my_favorites(
+    runner: SessionRunner = Depends(deps.session_runner("favorites.list")),
     current_user = Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = 100,
+    view: PromptView = "summary",
 ):
     """
-    Get all prompts favorited by the current user
+    Get all prompts favorited by the current user (summaries unless view=full)
     """
-    favorites = favorite_service.get_user_favorites(db, current_user.id, skip, limit)
-    return favorites
+    return await runner.run(_user_favorites, current_user.id, skip, limit, view)
 
 
 @router.get("/check/{prompt_id}", status_code=status.HTTP_200_OK)
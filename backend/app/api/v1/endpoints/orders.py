@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user
 from app.services import order as order_service
+from app.schemas.adapters import json_response, order_adapter, order_list_adapter
 from app.schemas.order import OrderCreate, OrderResponse, OrderDetailResponse, PaymentCreate
 from app.models.user import User
 from app.models.enums import OrderStatus
@@ -22,7 +23,7 @@ def create_order(
     Create new order.
     """
     order = order_service.create_order(db=db, order_data=order_in, user_id=current_user.id)
-    return order
+    return json_response(order_adapter, order, status_code=status.HTTP_201_CREATED)
 
 @router.post("/{order_id}/payments", status_code=status.HTTP_201_CREATED)
 def create_payment_for_order(
@@ -65,7 +66,7 @@ def read_orders(
     orders = order_service.get_orders_by_user(
         db=db, user_id=current_user.id, skip=skip, limit=limit
     )
-    return orders
+    return json_response(order_list_adapter, orders)
 
 @router.get("/{order_id}", response_model=dict)
 def read_order(
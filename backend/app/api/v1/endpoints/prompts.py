@@ -1,72 +1,148 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from app.api import deps
-from app.schemas.prompt import PromptInDB, PromptFilter, PromptCreate, PromptUpdate, PromptResponse
+from app.api.http_cache import cached_entry, conditional_response, etag_for, etag_matches
+from app.db.session import SessionRunner
+from app.core.cache import response_cache, PROMPTS_TAG, prompt_tag
+from app.schemas.adapters import prompt_adapter
+from app.schemas.prompt import (
+    PromptInDB, PromptSummary, PromptFilter, PromptCreate, PromptUpdate,
+    PromptResponse, PromptSummaryResponse, SearchMode, CountStrategy, PromptView,
+)
 from app.services import prompt as prompt_service
+from app.services.viewer_state import ViewerStateLoader
 from app.models.user import UserRole
 
 router = APIRouter()
 
-@router.get("/", response_model=PromptResponse)
-def list_prompts(
-    db: Session = Depends(deps.get_db),
+def _list_prompts_payload(db: Session, filter_params: PromptFilter) -> dict:
+    """Serialized (anonymous) listing page; raises ValueError on a bad cursor or sort"""
+    prompts, total_count, next_cursor, total_is_exact = prompt_service.get_prompts(db, filter_params)
+    total_pages = (total_count + filter_params.page_size - 1) // filter_params.page_size
+
+    response_class = PromptResponse if filter_params.view == "full" else PromptSummaryResponse
+    return response_class(
+        items=prompts,
+        total=total_count,
+        page=filter_params.page,
+        page_size=filter_params.page_size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        total_is_exact=total_is_exact,
+        facets=prompt_service.get_prompt_facets(db, filter_params) if filter_params.include_facets else None
+    ).model_dump(mode="json")
+
+def _prompt_detail_payload(db: Session, prompt_id: int) -> Optional[dict]:
+    prompt = prompt_service.get_prompt(db, prompt_id)
+    if not prompt:
+        return None
+    return prompt_adapter.dump_python(prompt_adapter.validate_python(prompt, from_attributes=True), mode="json")
+
+def _apply_viewer_flags(db: Session, user_id: int, items: List[dict]) -> None:
+    ViewerStateLoader(db, user_id).apply_to_dicts(items)
+
+@router.get("/", response_model=Union[PromptSummaryResponse, PromptResponse])
+async def list_prompts(
+    runner: SessionRunner = Depends(deps.session_runner("prompts.list")),
     current_user = Depends(deps.get_current_user_optional),
     category_id: int = None,
     min_price: float = None,
     max_price: float = None,
     is_featured: bool = None,
+    is_sequence: bool = None,
     search: str = None,
+    search_mode: SearchMode = "substring",
     sort_by: str = None,
     sort_order: str = "desc",
     page: int = 1,
     page_size: int = 10,
+    cursor: str = None,
+    count_strategy: CountStrategy = "exact",
+    view: PromptView = "summary",
+    include_facets: bool = False,
 ):
     """
-    List prompts with filtering, searching, and pagination
+    List prompts with filtering, searching, and pagination.
+    Pass the returned `next_cursor` as `cursor` to seek to the next page
+    instead of using `page` offsets. `count_strategy` trades accuracy of
+    `total` for speed (see `total_is_exact` in the response).
+    Items are compact summaries unless `view=full` is requested;
+    `include_facets=true` adds category, price, flag and rating counts.
+    `search` matches substrings of the title, description and content;
+    `search_mode=fulltext` uses ranked full-text search instead (whole words
+    and stems, no partial words) and enables `sort_by=relevance`.
+    The anonymous response is cached per filter; viewer flags are added per request.
     """
     filter_params = PromptFilter(
         category_id=category_id,
         min_price=min_price,
         max_price=max_price,
         is_featured=is_featured,
+        is_sequence=is_sequence,
         search=search,
+        search_mode=search_mode,
         sort_by=sort_by,
         sort_order=sort_order,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        count_strategy=count_strategy,
+        view=view,
+        include_facets=include_facets,
     )
 
-    user_id = current_user.id if current_user else None
-    prompts, total_count = prompt_service.get_prompts(db, filter_params, user_id)
-    total_pages = (total_count + page_size - 1) // page_size
+    cache_key = f"prompts:list:{prompt_service.listing_cache_key(filter_params)}"
+    payload = response_cache.get(cache_key)
+    if payload is None:
+        # Snapshot before reading, so an invalidation during the read keeps the result out of the cache
+        versions = response_cache.tag_versions([PROMPTS_TAG])
+        try:
+            payload = await runner.run(_list_prompts_payload, filter_params)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        response_cache.set(cache_key, payload, tags=[PROMPTS_TAG], versions=versions)
 
-    return PromptResponse(
-        items=prompts,
-        total=total_count,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    # Personalized flags are layered on after the (shared) cache lookup
+    if current_user:
+        await runner.run(_apply_viewer_flags, current_user.id, payload["items"])
+
+    return ORJSONResponse(payload)
 
 @router.get("/{prompt_id}", response_model=PromptInDB)
-def get_prompt(
+async def get_prompt(
     prompt_id: int,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    runner: SessionRunner = Depends(deps.session_runner("prompts.detail")),
     current_user = Depends(deps.get_current_user_optional),
 ):
     """
-    Get a single prompt by ID
+    Get a single prompt by ID.
+    Responses carry an ETag; send it back in If-None-Match to get 304 Not Modified.
     """
-    user_id = current_user.id if current_user else None
-    prompt = prompt_service.get_prompt(db, prompt_id, user_id)
-    if not prompt:
-        raise HTTPException(status_code=404, detail="Prompt not found")
+    cache_key = f"prompts:detail:{prompt_id}"
+    tags = [PROMPTS_TAG, prompt_tag(prompt_id)]
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        versions = response_cache.tag_versions([prompt_tag(prompt_id)])
+        entry = cached_entry(await runner.run(_prompt_detail_payload, prompt_id))
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Prompt not found")
+        response_cache.set(cache_key, entry, tags=[prompt_tag(prompt_id)], versions=versions)
+    payload, etag = entry["payload"], entry["etag"]
     
-    # Increment view count
-    prompt_service.increment_views(db, prompt_id)
+    if current_user:
+        # The personalized representation differs from the shared one only by the viewer's flags
+        await runner.run(_apply_viewer_flags, current_user.id, [payload])
+        flags = [payload["is_favorited"], payload["is_purchased"], payload["is_reviewed"]]
+        etag = etag_for([etag, current_user.id, flags])
     
-    return prompt
+    # Count a view only when the prompt is actually sent, not for revalidations (buffered write)
+    if not etag_matches(request, etag):
+        prompt_service.increment_views(prompt_id)
+    
+    return conditional_response(request, payload, etag, tags, anonymous=current_user is None)
 
 @router.post("/", response_model=PromptInDB, status_code=status.HTTP_201_CREATED)
 def create_prompt(
@@ -121,12 +197,13 @@ def delete_prompt(
         )
     return None
 
-@router.get("/user/me", response_model=List[PromptInDB])
+@router.get("/user/me", response_model=List[Union[PromptSummary, PromptInDB]])
 def get_my_prompts(
     db: Session = Depends(deps.get_db),
     current_user = Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = 100,
+    view: PromptView = "summary",
 ):
     """
     Get all prompts created by the current user
@@ -137,5 +214,6 @@ def get_my_prompts(
             detail="Only sellers can view their prompts"
         )
     
-    prompts = prompt_service.get_user_prompts(db, current_user.id, skip, limit)
-    return prompts 
\ No newline at end of file
+    prompts = prompt_service.get_user_prompts(db, current_user.id, skip, limit, user_id=current_user.id, view=view)
+    item_schema = PromptInDB if view == "full" else PromptSummary
+    return [item_schema.model_validate(prompt) for prompt in prompts] 
\ No newline at end of file
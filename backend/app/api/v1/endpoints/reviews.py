@@ -1,25 +1,34 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.db.session import SessionRunner
+from app.schemas.adapters import dump_json, review_list_adapter
 from app.schemas.review import ReviewInDB, ReviewCreate, ReviewUpdate, ReviewWithUser
 from app.services import review as review_service
 
 router = APIRouter()
 
 
+def _prompt_reviews(db: Session, prompt_id: int, skip: int, limit: int) -> bytes:
+    reviews = review_service.get_reviews_for_prompt(db, prompt_id, skip, limit)
+    return dump_json(review_list_adapter, reviews)
+
+
 @router.get("/prompt/{prompt_id}", response_model=List[ReviewWithUser])
-def get_prompt_reviews(
+async def get_prompt_reviews(
     prompt_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(deps.get_db)
+    runner: SessionRunner = Depends(deps.session_runner("reviews.list"))
 ):
     """
     Get all reviews for a specific prompt
     """
-    return review_service.get_reviews_for_prompt(db, prompt_id, skip, limit)
+    body = await runner.run(_prompt_reviews, prompt_id, skip, limit)
+    return Response(body, media_type="application/json")
 
 
 @router.get("/user/me/prompt/{prompt_id}", response_model=ReviewInDB)
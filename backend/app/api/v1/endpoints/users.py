@@ -5,6 +5,7 @@ from app.api import deps
 from app.models.user import User, UserRole
 from app.schemas.user import UserUpdate
 from app.services import user as user_service
+from app.services.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -67,5 +68,6 @@ def update_user_wallet(
     # Update the wallet address
     user.wallet_address = wallet_address
     db.commit()
+    principal_cache.invalidate(user_id)
     
     return {"success": True, "wallet_address": wallet_address}
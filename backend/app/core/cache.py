@@ -0,0 +1,323 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+    Data lives in the current process only, so every worker keeps its own copy.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a single entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+# Cache tags used to invalidate catalog responses on writes
+PROMPTS_TAG = "prompts"
+CATEGORIES_TAG = "categories"
+
+def prompt_tag(prompt_id: int) -> str:
+    return f"prompt:{prompt_id}"
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU/TTL backend. Tags are versioned: each entry remembers the
+    tag versions it was stored under and is treated as a miss once any of
+    them has been bumped by invalidate_tags. A write made with versions
+    snapshotted before the read is dropped if any of them has moved since.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._tag_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        value, tag_versions = entry
+        for tag, version in tag_versions.items():
+            if self._tag_versions.get(tag, 0) != version:
+                self._cache.delete(key)
+                return None
+        return value
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    def set(
+        self, key: str, value: str, ttl_seconds: float, tags: Iterable[str], versions: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        tag_versions = self.tag_versions(tags)
+        if versions is not None and any(versions.get(tag, 0) != version for tag, version in tag_versions.items()):
+            return False
+        # An invalidation racing this write bumps a version past tag_versions, so get() still misses
+        self._cache.set(key, (value, tag_versions), ttl_seconds=ttl_seconds)
+        return True
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "entries": len(self._cache), "max_entries": self._cache.max_entries}
+
+
+class RedisCacheBackend:
+    """
+    Backend for Redis or any server speaking the Redis protocol (e.g. a local
+    stand-in during development). Each tag is a set of the keys stored under it
+    plus a version counter bumped on invalidation; writes check the versions
+    and store the value in one script, so a read that raced an invalidation
+    is never cached. Requires the optional `redis` package.
+    """
+
+    # KEYS: value key, n version keys, n tag set keys; ARGV: value, ttl, n expected versions
+    SET_SCRIPT = """
+    local n = (#KEYS - 1) / 2
+    for i = 1, n do
+        if (redis.call('GET', KEYS[1 + i]) or '0') ~= ARGV[2 + i] then
+            return 0
+        end
+    end
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    for i = 1, n do
+        redis.call('SADD', KEYS[1 + n + i], KEYS[1])
+        redis.call('EXPIRE', KEYS[1 + n + i], ARGV[2])
+    end
+    return 1
+    """
+
+    def __init__(self, url: str, prefix: str = "prompt-share:cache:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the 'redis' package")
+
+        self._errors = (redis.RedisError,)
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._set_script = self._client.register_script(self.SET_SCRIPT)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}tag:{tag}"
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self._prefix}tag-version:{tag}"
+
+    def tag_versions(self, tags: Iterable[str]) -> Optional[Dict[str, str]]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        try:
+            versions = self._client.mget([self._version_key(tag) for tag in tags])
+        except self._errors:
+            logger.warning("Response cache version lookup failed for %s", tags, exc_info=True)
+            return None
+        return {tag: (version or b"0").decode() for tag, version in zip(tags, versions)}
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self._client.get(self._prefix + key)
+        except self._errors:
+            logger.warning("Response cache GET failed for %s", key, exc_info=True)
+            return None
+        return value.decode() if value is not None else None
+
+    def set(
+        self, key: str, value: str, ttl_seconds: float, tags: Iterable[str], versions: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        tags = list(tags)
+        if versions is None:
+            versions = self.tag_versions(tags)
+            if versions is None:
+                return False
+        ttl = max(int(ttl_seconds), 1)
+        keys = [self._prefix + key, *map(self._version_key, tags), *map(self._tag_key, tags)]
+        try:
+            return bool(self._set_script(keys=keys, args=[value, ttl, *(versions.get(tag, "0") for tag in tags)]))
+        except self._errors:
+            logger.warning("Response cache SET failed for %s", key, exc_info=True)
+            return False
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        try:
+            for tag in tags:
+                # Bump the version first: writes checked against the old one are refused from now on
+                self._client.incr(self._version_key(tag))
+                tag_key = self._tag_key(tag)
+                keys = self._client.smembers(tag_key)
+                self._client.delete(tag_key, *keys)
+        except self._errors:
+            logger.warning("Response cache invalidation failed for %s", list(tags), exc_info=True)
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=self._prefix + "*"))
+            if keys:
+                self._client.delete(*keys)
+        except self._errors:
+            logger.warning("Response cache clear failed", exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis"}
+
+
+class ResponseCache:
+    """
+    JSON response cache in front of a pluggable backend. A cache with no
+    backend is disabled: every get misses and writes are dropped.
+    """
+
+    def __init__(self, backend: Optional[Any], ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.stale_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get(self, key: str) -> Any:
+        """Return the decoded cached value, or None on a miss"""
+        value = self.backend.get(key) if self.backend else None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def tag_versions(self, tags: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        Snapshot of the tags' versions. Take it before reading the data to be
+        cached and pass it to set(), which then refuses to store the value if
+        any of the tags was invalidated in between.
+        """
+        return self.backend.tag_versions(tags) if self.backend else None
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        tags: Iterable[str] = (),
+        ttl_seconds: Optional[float] = None,
+        versions: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store a JSON-serializable value under `key`, tagged for invalidation"""
+        if not self.backend:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if not self.backend.set(key, json.dumps(value), ttl, list(tags), versions):
+            self.stale_writes += 1
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Drop every entry stored under any of the given tags"""
+        if self.backend:
+            self.backend.invalidate_tags(tags)
+
+    def clear(self) -> None:
+        if self.backend:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        backend_stats = self.backend.stats() if self.backend else {"backend": "none"}
+        return {
+            **backend_stats,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "stale_writes": self.stale_writes,
+        }
+
+
+def _build_response_cache() -> ResponseCache:
+    backend_name = settings.RESPONSE_CACHE_BACKEND
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    elif backend_name == "redis":
+        if not settings.RESPONSE_CACHE_URL:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires RESPONSE_CACHE_URL")
+        backend = RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+    else:
+        backend = None
+    return ResponseCache(backend, ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = _build_response_cache()
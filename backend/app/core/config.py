@@ -1,16 +1,92 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Prompt Share"
     API_V1_STR: str = "/api/v1"
+    DEBUG: bool = False
     SECRET_KEY: str = "your-secret-key-here"  # Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 240  # 2 hours
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
     DATABASE_URL: str
     
+    # Database connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before raising
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Reconnect connections older than this; -1 disables
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER_MODE: bool = False  # Behind a transaction-pooling PgBouncer: no client-side pool
+    
+    # Read replicas for catalog reads (empty: everything uses DATABASE_URL)
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_RETRY_SECONDS: float = 30.0  # How long a failing replica is skipped
+    REPLICA_PIN_SECONDS: float = 5.0  # Reads stay on the primary this long after a user writes
+    # Where those pins live: "memory" (this worker only) or "redis" (shared by all workers and hosts;
+    # needs the redis package). Use redis whenever more than one worker serves traffic.
+    REPLICA_PIN_STORE: str = "memory"
+    REPLICA_PIN_REDIS_URL: Optional[str] = None  # Defaults to RESPONSE_CACHE_URL
+    
+    # Async (asyncpg) read path
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with the asyncpg driver
+    # Routes served on an AsyncSession instead of the threadpool:
+    # prompts.list, prompts.detail, categories.list, categories.detail, reviews.list, favorites.list
+    ASYNC_DB_ROUTES: List[str] = []
+    
+    # Response cache for public catalog queries
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory", "redis" (needs the redis package) or "none"
+    RESPONSE_CACHE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    
+    # Catalog listing counts
+    PROMPT_COUNT_CACHE_TTL_SECONDS: int = 30
+    PROMPT_COUNT_ESTIMATE_THRESHOLD: int = 10000  # Below this the estimate strategy counts exactly
+    
+    # Prompt view counter (write-behind buffer)
+    VIEW_COUNT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    VIEW_COUNT_MAX_PENDING: int = 5000  # Pending prompts that trigger an early flush
+    
+    # Authenticated principal cache (per process; 0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing (bcrypt in a dedicated process pool; 0 workers hashes inline)
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # Existing hashes are upgraded on the next login when this changes
+    PASSWORD_HASH_WORKERS: int = 2
+    # Waiting jobs beyond the busy workers before requests get 503. Each waiting request holds a
+    # request thread, so workers + pending is capped at hashing.MAX_BLOCKED_THREADS.
+    PASSWORD_HASH_MAX_PENDING: int = 6
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+    
+    # Per-request SQL instrumentation
+    QUERY_STATS_HEADERS: Optional[bool] = None  # X-DB-* response headers; defaults to DEBUG
+    QUERY_REPEAT_THRESHOLD: int = 5  # Same statement this many times in one request is flagged as N+1
+    
+    # Slow query log (opt-in)
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_MAX_ENTRIES: int = 500
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1  # Share of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS: int = 5000
+    SLOW_QUERY_DUMP_PATH: str = "slow_queries.jsonl"
+    
+    # Prometheus metrics (set PROMETHEUS_MULTIPROC_DIR in the environment for multi-worker setups)
+    METRICS_ENABLED: bool = True
+    METRICS_REFRESH_SECONDS: float = 5.0  # How often each worker publishes its pool/cache gauges
+    
+    # HTTP caching of anonymous catalog responses (browsers / CDN)
+    CATALOG_MAX_AGE_SECONDS: int = 30
+    CATALOG_CDN_MAX_AGE_SECONDS: int = 300
+    
+    # Response compression (gzip, or brotli for clients that accept br)
+    COMPRESSION_MINIMUM_SIZE: int = 1000  # Bytes; smaller bodies are sent as-is
+    GZIP_COMPRESSION_LEVEL: int = 6
+    BROTLI_ENABLED: bool = True
+    BROTLI_QUALITY: int = 4  # 0-11; higher levels cost far more CPU for little gain on JSON
+    
     # CORS Configuration
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = ["http://localhost:3000"]
     
@@ -0,0 +1,138 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional, Tuple
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# Configure password hashing. Hashes made with a different cost are reported
+# as needing an update, so verify_and_update upgrades them on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+
+# Login and register are sync handlers, so every caller waiting on a hash holds
+# one of AnyIO's request threads (40 by default) until the job finishes. No more
+# than this many callers may wait at once, leaving the rest for other routes.
+MAX_BLOCKED_THREADS = 10
+
+
+class HashPoolSaturated(Exception):
+    """Raised instead of queueing when the password hashing pool is full"""
+
+
+# Worker entry points; module-level so they can be pickled into the pool processes
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt in a dedicated process pool so hashing neither holds the GIL
+    nor ties up the request threadpool for long. At most `workers` jobs run
+    and `max_pending` more may wait, capped at MAX_BLOCKED_THREADS in total;
+    beyond that calls fail fast with HashPoolSaturated rather than queueing
+    behind a login burst. A job that times out keeps its slot until the
+    worker actually finishes it.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.capacity = min(workers + max_pending, MAX_BLOCKED_THREADS)
+        self.timeout = timeout
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self._in_flight = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also returns a new hash when the stored one uses outdated settings"""
+        return self._run(_verify_and_update, password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and throughput counters"""
+        with self._lock:
+            in_flight = self._in_flight
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "capacity": self.capacity,
+            "in_flight": in_flight,
+            "queue_depth": max(in_flight - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "avg_seconds": self.total_seconds / self.completed if self.completed else 0.0,
+        }
+
+    def _run(self, func: Callable, *args: Any) -> Any:
+        if self.workers <= 0:
+            return func(*args)
+
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise HashPoolSaturated()
+            self._in_flight += 1
+            if self._executor is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            executor = self._executor
+
+        started = time.perf_counter()
+
+        def done(future: Future) -> None:
+            # Runs when the worker finishes (or the job is cancelled), not when the caller gives up
+            with self._lock:
+                self._in_flight -= 1
+                if not future.cancelled():
+                    self.completed += 1
+                    self.total_seconds += time.perf_counter() - started
+
+        try:
+            future = executor.submit(func, *args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(done)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise HashPoolSaturated("Password hashing timed out")
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
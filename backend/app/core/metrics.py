@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Multi-worker deployments (gunicorn, uvicorn --workers) must point
+# PROMETHEUS_MULTIPROC_DIR at an empty directory shared by the workers; the
+# metrics endpoint then aggregates every worker's samples. Gauges use "live"
+# modes so values from exited workers drop out once mark_worker_dead is called;
+# counters keep exited workers' counts, so totals never go backwards.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# Request latency buckets in seconds, from cache hits to slow catalog queries
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"]
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method", "route"], multiprocess_mode="livesum"
+)
+
+db_pool_connections = Gauge(
+    "db_pool_connections", "Connections of the primary pool by state", ["state"], multiprocess_mode="livesum"
+)
+# Monotonic totals kept by the pool, caches and hash pool are published as
+# counters (exposed with a _total suffix) by adding what grew since the last refresh
+db_pool_checkouts = Counter("db_pool_checkouts", "Pool checkouts")
+db_pool_wait_seconds = Counter("db_pool_wait_seconds", "Time spent waiting for a pooled connection")
+db_pool_timeouts = Counter("db_pool_timeouts", "Pool checkout timeouts")
+cache_requests = Counter(
+    "cache_requests", "Cache lookups; hit ratio = rate(hit) / rate(hit + miss)", ["cache", "result"]
+)
+password_hash_jobs = Gauge(
+    "password_hash_jobs", "Password hashing jobs by state", ["state"], multiprocess_mode="livesum"
+)
+password_hash_rejected = Counter("password_hash_rejected", "Password hashing jobs rejected because the pool was full")
+password_hash_timeouts = Counter("password_hash_timeouts", "Password hashing jobs the caller stopped waiting for")
+# Statements per request: a rising upper quantile on one route is the signature of an N+1 loop
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+db_statements_per_request = Histogram(
+    "db_statements_per_request", "SQL statements executed per HTTP request", ["method", "route"],
+    buckets=STATEMENT_BUCKETS,
+)
+db_n_plus_one_requests_total = Counter(
+    "db_n_plus_one_requests_total", "Requests that repeated a statement QUERY_REPEAT_THRESHOLD+ times",
+    ["method", "route"],
+)
+view_counter_pending = Gauge(
+    "view_counter_pending_views", "Buffered prompt views not yet written", multiprocess_mode="livesum"
+)
+
+_refresh_lock = threading.Lock()
+_last_refresh = 0.0
+# Last total published per (counter, labels), guarded by _refresh_lock
+_published: Dict[Tuple[Any, Tuple[str, ...]], float] = {}
+
+
+def _publish_total(counter: Counter, total: float, *labels: str) -> None:
+    """Advance `counter` to `total`; a total that went backwards (e.g. a pool rebuilt) restarts the baseline"""
+    key = (counter, labels)
+    delta = total - _published.get(key, 0.0)
+    if delta > 0:
+        (counter.labels(*labels) if labels else counter).inc(delta)
+    _published[key] = total
+
+
+def refresh_runtime_gauges(min_interval: float = 0.0) -> None:
+    """
+    Copy this worker's pool, cache and hashing stats into gauges. Called from
+    the metrics middleware at most every `min_interval` seconds, so every
+    worker's values stay current in the multiprocess files, not just the one
+    that answers the scrape.
+    """
+    global _last_refresh
+    now = time.monotonic()
+    if now - _last_refresh < min_interval or not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        _last_refresh = now
+        # Imported here: these modules import settings-dependent singletons
+        from app.core.cache import response_cache
+        from app.core.hashing import password_hash_pool
+        from app.db.session import pool_stats
+        from app.services.principal_cache import principal_cache
+        from app.services.view_counter import view_buffer
+
+        pool = pool_stats()
+        if "checked_out" in pool:
+            db_pool_connections.labels("checked_out").set(pool["checked_out"])
+            db_pool_connections.labels("checked_in").set(pool["checked_in"])
+            db_pool_connections.labels("overflow").set(max(pool["overflow"], 0))
+        if "checkouts" in pool:
+            _publish_total(db_pool_checkouts, pool["checkouts"])
+            _publish_total(db_pool_wait_seconds, pool["avg_wait_seconds"] * pool["checkouts"])
+            _publish_total(db_pool_timeouts, pool["timeouts"])
+
+        for name, stats in (("response", response_cache.stats()), ("principal", principal_cache.stats())):
+            _publish_total(cache_requests, stats["hits"], name, "hit")
+            _publish_total(cache_requests, stats["misses"], name, "miss")
+
+        hashing = password_hash_pool.stats()
+        password_hash_jobs.labels("running").set(hashing["in_flight"] - hashing["queue_depth"])
+        password_hash_jobs.labels("queued").set(hashing["queue_depth"])
+        _publish_total(password_hash_rejected, hashing["rejected"])
+        _publish_total(password_hash_timeouts, hashing["timeouts"])
+
+        view_counter_pending.set(view_buffer.stats()["pending_views"])
+    finally:
+        _refresh_lock.release()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition text for all workers (multiprocess) or this process"""
+    refresh_runtime_gauges()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Call from the process manager when a worker exits (e.g. gunicorn's child_exit hook)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -1,17 +1,10 @@
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional, Dict
+from typing import Any, Union, Optional, Dict, Tuple
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.hashing import pwd_context, password_hash_pool
 from app.models.user import User
 
-# Configure password hashing
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12  # Number of rounds for bcrypt
-)
-
 def create_token(
     subject: Union[str, Any],
     token_type: str = "access",
@@ -72,11 +65,15 @@ def create_tokens(user: User) -> Dict[str, Any]:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hash_pool.verify_and_update(plain_password, hashed_password)[0]
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; the second item is a replacement hash if the stored one is outdated"""
+    return password_hash_pool.verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return password_hash_pool.hash(password)
 
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
     """Verify JWT token and return payload"""
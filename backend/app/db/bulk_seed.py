@@ -0,0 +1,450 @@
+import bisect
+import csv
+import io
+import logging
+import random
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Table, text
+from sqlalchemy.orm import Session
+
+from app.core.hashing import pwd_context
+from app.models.enums import OrderStatus
+from app.models.favorite import Favorite
+from app.models.order import Order
+from app.models.payment import Payment, PaymentMethod, PaymentStatus
+from app.models.prompt import Prompt
+from app.models.prompt_usage import PromptUsage
+from app.models.review import Review
+from app.models.user import User, UserRole
+from app.services.category import recount_prompts
+
+logger = logging.getLogger(__name__)
+
+# Every seeded user shares this password; it is hashed once per run
+SEED_PASSWORD = "password123"
+
+# Rows per COPY / executemany batch
+CHUNK_SIZE = 50000
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn", "Linh", "Minh")
+LAST_NAMES = ("Nguyen", "Smith", "Garcia", "Kim", "Chen", "Tran", "Johnson", "Lee", "Brown", "Pham", "Wilson", "Lopez")
+ADJECTIVES = ("Ultimate", "Quick", "Advanced", "Simple", "Creative", "Professional", "Essential", "Smart", "Viral", "Expert")
+TOPICS = ("Blog Post", "Code Review", "Logo Brief", "Sales Email", "Lesson Plan", "Short Story", "Ad Copy",
+          "Habit Tracker", "API Design", "Poster Concept", "Research Summary", "Meal Plan", "Travel Guide")
+CONTENT_SENTENCE = (
+    "You are an expert assistant. Given the context below, produce a well structured answer "
+    "with a short summary, numbered steps and a final checklist. "
+)
+
+# Order status mix; payments exist for paid and refunded orders
+ORDER_STATUSES = (OrderStatus.PAID, OrderStatus.PENDING, OrderStatus.FAILED, OrderStatus.REFUNDED)
+ORDER_STATUS_WEIGHTS = (85, 8, 5, 2)
+# Ratings lean positive, as on most marketplaces
+RATINGS = (1.0, 2.0, 3.0, 4.0, 5.0)
+RATING_WEIGHTS = (5, 7, 15, 33, 40)
+
+# Timestamps are naive UTC; generators keep them as seconds since this epoch
+EPOCH = datetime(1970, 1, 1)
+
+
+def _seconds(moment: datetime) -> float:
+    return (moment - EPOCH).total_seconds()
+
+
+def _moment(seconds: float) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+@dataclass
+class SeedCounts:
+    users: int = 10000
+    prompts: int = 100000
+    orders: int = 300000
+    reviews: int = 100000
+    favorites: int = 200000
+    usage: int = 200000
+
+    def scaled(self, factor: float) -> "SeedCounts":
+        return SeedCounts(**{name: int(value * factor) for name, value in vars(self).items()})
+
+
+class PowerLaw:
+    """
+    Samples 0..n-1 with Zipf-like weights 1 / rank**exponent. Ranks are
+    shuffled so popularity is not correlated with id order.
+    """
+
+    def __init__(self, n: int, exponent: float, rng: random.Random):
+        ranks = list(range(1, n + 1))
+        rng.shuffle(ranks)
+        self.cumulative = list(_accumulate(1 / rank ** exponent for rank in ranks))
+        self.total = self.cumulative[-1]
+        self.rng = rng
+
+    def sample(self) -> int:
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.total)
+
+
+def _accumulate(values: Iterable[float]) -> Iterator[float]:
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+class BulkWriter:
+    """Loads row iterators with COPY on psycopg2, executemany with other drivers"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.copy = db.get_bind().dialect.driver == "psycopg2"
+
+    def write(self, table: Table, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        written = 0
+        for chunk in _chunks(rows, CHUNK_SIZE):
+            if self.copy:
+                self._copy(table, columns, chunk)
+            else:
+                self.db.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+            written += len(chunk)
+        logger.info("Loaded %d rows into %s", written, table.name)
+        return written
+
+    def _copy(self, table: Table, columns: Sequence[str], chunk: List[Sequence[Any]]) -> None:
+        buffer = io.StringIO()
+        # csv writes None as an unquoted empty field, which COPY reads as NULL
+        csv.writer(buffer).writerows(chunk)
+        buffer.seek(0)
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        cursor = self.db.connection().connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+        finally:
+            cursor.close()
+
+
+def _chunks(rows: Iterable[Sequence[Any]], size: int) -> Iterator[List[Sequence[Any]]]:
+    chunk: List[Sequence[Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class BulkSeeder:
+    """
+    Generates a production-shaped dataset: users and prompts created with
+    growth over `days` (more rows recently), prompt popularity following a
+    power law for orders, reviews, favorites and usage, and sellers with a
+    long tail of catalog sizes. The same seed and counts always produce the
+    same rows. Ids continue after the current maximum, so it can run on a
+    non-empty database. Everything is loaded in one transaction.
+    """
+
+    def __init__(self, db: Session, counts: SeedCounts, seed: int = 42, days: int = 730,
+                 end: Optional[datetime] = None):
+        self.db = db
+        self.counts = counts
+        self.seed = seed
+        self.end = end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.start = self.end - timedelta(days=days)
+        self.writer = BulkWriter(db)
+        self.hashed_password = pwd_context.hash(SEED_PASSWORD)
+
+        self.first_id: Dict[str, int] = {}
+        self.seller_ids: List[int] = []
+        self.prompt_prices = array("d")
+        self.prompt_created = array("d")
+        # (user_id, prompt_id) of paid orders, the population reviews are drawn from
+        self.paid_users = array("l")
+        self.paid_prompts = array("l")
+        # Orders that get a payment row: paid and refunded ones
+        self.settled_orders = array("l")
+        self.settled_amounts = array("d")
+        self.settled_at = array("d")
+        self.settled_refunded = bytearray()
+
+    def rng(self, name: str) -> random.Random:
+        """Independent deterministic stream per table, so changing one count doesn't reshuffle the others"""
+        return random.Random(f"{self.seed}:{name}")
+
+    def _next_id(self, table: Table) -> int:
+        current = self.db.execute(text(f'SELECT max(id) FROM "{table.name}"')).scalar()
+        self.first_id[table.name] = (current or 0) + 1
+        return self.first_id[table.name]
+
+    def _growth_time(self, rng: random.Random) -> datetime:
+        """Timestamp in [start, end) with density rising linearly towards `end`"""
+        return self.start + (self.end - self.start) * (rng.random() ** 0.5)
+
+    def _after(self, rng: random.Random, timestamp: float) -> datetime:
+        """Timestamp between `timestamp` and `end`, biased towards the former"""
+        end = _seconds(self.end)
+        return _moment(timestamp + (end - timestamp) * rng.random() ** 2)
+
+    def run(self) -> None:
+        category_ids = [id for (id,) in self.db.execute(text("SELECT id FROM category ORDER BY id"))]
+        if not category_ids:
+            raise RuntimeError("No categories found; run scripts/init_db.py first")
+
+        self.seed_users()
+        self.seed_prompts(category_ids)
+        self.seed_orders()
+        self.seed_reviews()
+        self.seed_favorites()
+        self.seed_usage()
+        self.reset_sequences()
+        self.db.commit()
+        self.recount()
+
+    def seed_users(self) -> None:
+        table = User.__table__
+        first = self._next_id(table)
+        rng = self.rng("user")
+        sellers = max(1, self.counts.users // 10)
+        self.seller_ids = list(range(first, first + sellers))
+        columns = ("id", "email", "username", "hashed_password", "full_name", "role", "is_active",
+                   "is_verified", "created_at", "updated_at")
+
+        def rows():
+            for offset in range(self.counts.users):
+                id = first + offset
+                role = UserRole.SELLER if offset < sellers else UserRole.USER
+                created = self._growth_time(rng)
+                yield (
+                    id, f"user{id}@seed.example.com", f"seed_user{id}", self.hashed_password,
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", role.name,
+                    rng.random() > 0.01, rng.random() < 0.7, created, created,
+                )
+
+        self.writer.write(table, columns, rows())
+
+    def seed_prompts(self, category_ids: List[int]) -> None:
+        table = Prompt.__table__
+        first = self._next_id(table)
+        rng = self.rng("prompt")
+        sellers = PowerLaw(len(self.seller_ids), 1.2, rng)
+        categories = PowerLaw(len(category_ids), 0.8, rng)
+        columns = ("id", "title", "description", "content", "price", "is_active", "is_featured",
+                   "views_count", "sales_count", "rating", "is_sequence", "order_index",
+                   "seller_id", "category_id", "created_at", "updated_at")
+
+        def rows():
+            for offset in range(self.counts.prompts):
+                id = first + offset
+                topic = rng.choice(TOPICS)
+                # Log-normal prices around $5, a tenth of prompts free
+                price = 0.0 if rng.random() < 0.1 else round(min(rng.lognormvariate(1.6, 0.8), 199.0), 2)
+                created = self._growth_time(rng)
+                self.prompt_prices.append(price)
+                self.prompt_created.append(_seconds(created))
+                yield (
+                    id, f"{rng.choice(ADJECTIVES)} {topic} Prompt #{id}",
+                    f"Generate a {topic.lower()} tailored to your audience.",
+                    CONTENT_SENTENCE * rng.randint(1, 8), price,
+                    rng.random() > 0.05, rng.random() < 0.02, 0, 0, 0.0, False, 0,
+                    self.seller_ids[sellers.sample()], category_ids[categories.sample()], created, created,
+                )
+
+        self.writer.write(table, columns, rows())
+
+    def seed_orders(self) -> None:
+        orders, payments = Order.__table__, Payment.__table__
+        first = self._next_id(orders)
+        first_payment = self._next_id(payments)
+        rng = self.rng("order")
+        prompts = PowerLaw(self.counts.prompts, 1.1, rng)
+        buyers = PowerLaw(self.counts.users, 0.6, rng)
+        first_user, first_prompt = self.first_id["user"], self.first_id["prompt"]
+
+        def order_rows():
+            for offset in range(self.counts.orders):
+                id = first + offset
+                index = prompts.sample()
+                user_id, prompt_id = first_user + buyers.sample(), first_prompt + index
+                status = rng.choices(ORDER_STATUSES, weights=ORDER_STATUS_WEIGHTS)[0]
+                created = self._after(rng, self.prompt_created[index])
+                amount = self.prompt_prices[index]
+                if status in (OrderStatus.PAID, OrderStatus.REFUNDED):
+                    self.settled_orders.append(id)
+                    self.settled_amounts.append(amount)
+                    self.settled_at.append(_seconds(created))
+                    self.settled_refunded.append(status == OrderStatus.REFUNDED)
+                if status == OrderStatus.PAID:
+                    self.paid_users.append(user_id)
+                    self.paid_prompts.append(prompt_id)
+                yield (
+                    id, f"SEED-{id:010d}", amount, status.name, created, created, "fiat", user_id, prompt_id,
+                )
+
+        self.writer.write(
+            orders,
+            ("id", "order_number", "amount", "status", "created_at", "updated_at", "payment_type",
+             "user_id", "prompt_id"),
+            order_rows(),
+        )
+
+        methods = [method for method in PaymentMethod if method != PaymentMethod.SOL]
+
+        def payment_rows():
+            for offset, order_id in enumerate(self.settled_orders):
+                status = PaymentStatus.REFUNDED if self.settled_refunded[offset] else PaymentStatus.COMPLETED
+                created = _moment(self.settled_at[offset])
+                yield (
+                    first_payment + offset, f"seed-tx-{order_id}", self.settled_amounts[offset],
+                    rng.choice(methods).name, status.name, created, created, order_id,
+                )
+
+        self.writer.write(
+            payments,
+            ("id", "transaction_id", "amount", "method", "status", "created_at", "updated_at", "order_id"),
+            payment_rows(),
+        )
+
+    def seed_reviews(self) -> None:
+        table = Review.__table__
+        first = self._next_id(table)
+        rng = self.rng("review")
+        # Reviews only come from buyers, at most one per buyer and prompt
+        wanted = min(self.counts.reviews, len(self.paid_users))
+        seen = set()
+
+        def rows():
+            attempts = 0
+            while len(seen) < wanted and attempts < wanted * 3:
+                attempts += 1
+                index = rng.randrange(len(self.paid_users))
+                user_id, prompt_id = self.paid_users[index], self.paid_prompts[index]
+                if (user_id, prompt_id) in seen:
+                    continue
+                seen.add((user_id, prompt_id))
+                created = self._after(rng, self.prompt_created[prompt_id - self.first_id["prompt"]])
+                rating = rng.choices(RATINGS, weights=RATING_WEIGHTS)[0]
+                yield (first + len(seen) - 1, rating, "Worked well for my use case." if rating >= 4 else None,
+                       created, created, user_id, prompt_id)
+
+        self.writer.write(
+            table, ("id", "rating", "comment", "created_at", "updated_at", "user_id", "prompt_id"), rows()
+        )
+
+    def seed_favorites(self) -> None:
+        table = Favorite.__table__
+        first = self._next_id(table)
+        rng = self.rng("favorite")
+        prompts = PowerLaw(self.counts.prompts, 1.1, rng)
+        users = PowerLaw(self.counts.users, 0.8, rng)
+        first_user, first_prompt = self.first_id["user"], self.first_id["prompt"]
+        seen = set()
+
+        def rows():
+            attempts = 0
+            while len(seen) < self.counts.favorites and attempts < self.counts.favorites * 3:
+                attempts += 1
+                pair = (first_user + users.sample(), first_prompt + prompts.sample())
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                created = self._after(rng, self.prompt_created[pair[1] - first_prompt])
+                yield (first + len(seen) - 1, pair[0], pair[1], created, created)
+
+        self.writer.write(table, ("id", "user_id", "prompt_id", "created_at", "updated_at"), rows())
+
+    def seed_usage(self) -> None:
+        table = PromptUsage.__table__
+        first = self._next_id(table)
+        rng = self.rng("prompt_usage")
+        prompts = PowerLaw(self.counts.prompts, 1.1, rng)
+        users = PowerLaw(self.counts.users, 0.8, rng)
+        first_user, first_prompt = self.first_id["user"], self.first_id["prompt"]
+
+        def rows():
+            for offset in range(self.counts.usage):
+                index = prompts.sample()
+                used = self._after(rng, self.prompt_created[index])
+                success = rng.random() > 0.03
+                yield (
+                    first + offset, used, "Sample input", "Sample output" if success else None, success,
+                    None if success else "Upstream model timeout", first_user + users.sample(),
+                    first_prompt + index, used, used,
+                )
+
+        self.writer.write(
+            table,
+            ("id", "usage_date", "input_text", "output_text", "success", "error_message", "user_id",
+             "prompt_id", "created_at", "updated_at"),
+            rows(),
+        )
+
+    def reset_sequences(self) -> None:
+        """Explicit ids bypass the serial sequences; move them past the new rows"""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+        for name in self.first_id:
+            self.db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('\"{name}\"', 'id'), "
+                f"coalesce((SELECT max(id) FROM \"{name}\"), 1))"
+            ))
+
+    def recount(self) -> None:
+        """Rebuild the denormalized counters the services normally maintain on write"""
+        params = {"first": self.first_id["prompt"], "paid": OrderStatus.PAID.name}
+        self.db.execute(text(
+            """
+            UPDATE prompt
+            SET sales_count = agg.sales
+            FROM (
+                SELECT prompt_id, count(*) AS sales
+                FROM "order"
+                WHERE status = :paid AND prompt_id >= :first
+                GROUP BY prompt_id
+            ) AS agg
+            WHERE prompt.id = agg.prompt_id
+            """
+        ), params)
+        # There is no view log to derive views from; keep them proportional to sales with some spread
+        self.db.execute(text(
+            "UPDATE prompt SET views_count = sales_count * (20 + id % 40) + id % 50 WHERE id >= :first"
+        ), params)
+        # Same aggregate as the rating backfill in migration e8b3c5a1f702
+        self.db.execute(text(
+            """
+            UPDATE prompt
+            SET rating_sum = agg.rating_sum,
+                rating_count = agg.rating_count,
+                rating = agg.rating_sum / agg.rating_count,
+                rating_1_count = agg.stars_1,
+                rating_2_count = agg.stars_2,
+                rating_3_count = agg.stars_3,
+                rating_4_count = agg.stars_4,
+                rating_5_count = agg.stars_5
+            FROM (
+                SELECT prompt_id,
+                       sum(rating) AS rating_sum,
+                       count(*) AS rating_count,
+                       count(*) FILTER (WHERE star = 1) AS stars_1,
+                       count(*) FILTER (WHERE star = 2) AS stars_2,
+                       count(*) FILTER (WHERE star = 3) AS stars_3,
+                       count(*) FILTER (WHERE star = 4) AS stars_4,
+                       count(*) FILTER (WHERE star = 5) AS stars_5
+                FROM (
+                    SELECT prompt_id, rating, least(greatest(floor(rating), 1), 5) AS star
+                    FROM review
+                    WHERE prompt_id >= :first
+                ) AS rated
+                GROUP BY prompt_id
+            ) AS agg
+            WHERE prompt.id = agg.prompt_id
+            """
+        ), params)
+        self.db.commit()
+        logger.info("Recounted prompt sales, views and ratings")
+
+        # Category counts go through the service, which also drops cached category lists
+        recount_prompts(self.db)
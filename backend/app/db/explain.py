@@ -0,0 +1,30 @@
+import json
+from typing import Any
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) of a statement. The executing dialect compiles and
+    binds it, so parameters use whichever paramstyle its driver expects
+    (psycopg2 or asyncpg).
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def plan_of(result: Any) -> dict:
+    """Top plan node from an executed Explain; asyncpg may hand back the JSON as text"""
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
@@ -7,7 +7,7 @@ backend_dir = Path(__file__).resolve().parent.parent.parent
 sys.path.append(str(backend_dir))
 
 from sqlalchemy.orm import Session
-from app.db.base import engine
+from app.db.session import engine
 from app.db.init_db import init_db
 from app.db.base import Base
 
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """SQL statements executed within one request (or one count_queries block)"""
+
+    def __init__(self, route_resolver: Optional[Callable[[], str]] = None):
+        self.route_resolver = route_resolver
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: List[str] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements.append(statement)
+        # Bound parameters are placeholders, so the text is the statement's shape
+        self.shapes[statement] += 1
+
+    @property
+    def route(self) -> Optional[str]:
+        """Route template of the request being served, once it has been routed"""
+        return self.route_resolver() if self.route_resolver else None
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times: likely N+1 loops"""
+        threshold = threshold or settings.QUERY_REPEAT_THRESHOLD
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Process-wide collectors from count_queries(); these see statements from every thread
+_collectors: List[QueryStats] = []
+_collectors_lock = threading.Lock()
+
+
+# A DBAPI connection runs one statement at a time, so one start time per connection suffices
+STARTED_KEY = "query_stats_started"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None or _collectors:
+        conn.info[STARTED_KEY] = time.perf_counter()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; don't leave its start time behind
+    if context.connection is not None:
+        context.connection.info.pop(STARTED_KEY, None)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop(STARTED_KEY, None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for collector in _collectors:
+        collector.record(statement, elapsed)
+
+
+def start_request(route_resolver: Optional[Callable[[], str]] = None) -> Tuple[QueryStats, Any]:
+    """Begin collecting for the current request context; pass the token to end_request"""
+    stats = QueryStats(route_resolver)
+    return stats, _current.set(stats)
+
+
+def end_request(token: Any) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Collect every statement executed anywhere in the process while the block
+    runs, including requests served by a TestClient on its own thread.
+    """
+    stats = QueryStats()
+    with _collectors_lock:
+        _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _collectors_lock:
+            _collectors.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError if the block runs more than `limit` statements,
+    e.g. around a TestClient call to guard an endpoint against N+1 regressions.
+    """
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {n}x {shape}" for shape, n in stats.shapes.most_common())
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.count}:\n{listing}")
+
+
+class RouteQueryTotals:
+    """Per-route totals across requests, for production monitoring"""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, stats: QueryStats, flagged: bool) -> None:
+        with self._lock:
+            totals = self._routes.setdefault(
+                route, {"requests": 0, "queries": 0, "db_seconds": 0.0, "max_queries": 0, "n_plus_one": 0}
+            )
+            totals["requests"] += 1
+            totals["queries"] += stats.count
+            totals["db_seconds"] += stats.seconds
+            totals["max_queries"] = max(totals["max_queries"], stats.count)
+            totals["n_plus_one"] += int(flagged)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {route: dict(totals) for route, totals in self._routes.items()}
+
+
+route_query_totals = RouteQueryTotals()
@@ -0,0 +1,208 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.session import async_engine_options, async_url, engine, engine_options, get_async_engine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaSet:
+    """
+    Round robin over read replicas. A replica whose connections fail is
+    skipped for `retry_seconds`, then tried again; with no healthy replica
+    left, callers fall back to the primary.
+    """
+
+    def __init__(self, engines: List[Engine], retry_seconds: float):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until: Dict[int, float] = {}
+        self._cycle = itertools.cycle(range(len(engines)))
+        self._lock = threading.Lock()
+        for index, replica in enumerate(engines):
+            event.listen(replica, "handle_error", self._error_listener(index))
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica, or None if there are none"""
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = next(self._cycle)
+                if self._down_until.get(index, 0) <= now:
+                    return self.engines[index]
+        return None
+
+    def mark_down(self, index: int) -> None:
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+        logger.warning("Read replica %d marked down for %.0fs", index, self.retry_seconds)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return [
+            {
+                "replica": index,
+                "url": replica.url.render_as_string(hide_password=True),
+                "healthy": self._down_until.get(index, 0) <= now,
+            }
+            for index, replica in enumerate(self.engines)
+        ]
+
+    def _error_listener(self, index: int):
+        def on_error(context) -> None:
+            # Only connectivity problems take a replica out of rotation, not bad SQL
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(index)
+        return on_error
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to one replica (picked once, so a request sees a
+    single snapshot) and everything else to the primary bind: flushes, DML
+    statements, and sessions created with use_primary=True.
+    """
+
+    def __init__(self, *args: Any, replicas: Optional[ReplicaSet] = None, use_primary: bool = False, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.use_primary = use_primary
+        self._replica: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs: Any):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self.use_primary or self.replicas is None or self._flushing:
+            return primary
+        if clause is not None and getattr(clause, "is_dml", False):
+            return primary
+        if self._replica is None:
+            self._replica = self.replicas.choose() or primary
+        return self._replica
+
+
+class PrimaryPins:
+    """
+    Read-your-writes: users who just wrote are served from the primary for
+    `pin_seconds`, long enough for replicas to catch up, so replica lag
+    should stay well below the pin window. Without `redis_url` pins live in
+    this process only; with it they expire in Redis and every worker sees
+    them. If Redis is unreachable, reads conservatively go to the primary.
+    """
+
+    def __init__(
+        self,
+        pin_seconds: float,
+        redis_url: Optional[str] = None,
+        max_entries: int = 100000,
+        prefix: str = "prompt-share:primary-pin:",
+    ):
+        self.pin_seconds = pin_seconds
+        self._pins = TTLCache(max_entries=max_entries, ttl_seconds=pin_seconds)
+        self._prefix = prefix
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("REPLICA_PIN_STORE=redis requires the 'redis' package")
+            self._errors = (redis.RedisError,)
+            self._redis = redis.Redis.from_url(redis_url)
+
+    @property
+    def shared(self) -> bool:
+        """Whether lookups go over the network (callers on the event loop should use a thread)"""
+        return self._redis is not None
+
+    def pin(self, user_id: Optional[int]) -> None:
+        if user_id is None or replicas is None:
+            return
+        if self._redis is None:
+            self._pins.set(user_id, True)
+            return
+        try:
+            self._redis.set(f"{self._prefix}{user_id}", 1, px=max(int(self.pin_seconds * 1000), 1))
+        except self._errors:
+            logger.warning("Could not store the primary pin for user %s", user_id, exc_info=True)
+
+    def is_pinned(self, user_id: Optional[int]) -> bool:
+        if user_id is None or replicas is None:
+            return False
+        if self._redis is None:
+            return self._pins.get(user_id, False)
+        try:
+            return bool(self._redis.exists(f"{self._prefix}{user_id}"))
+        except self._errors:
+            logger.warning("Could not read the primary pin for user %s", user_id, exc_info=True)
+            return True
+
+
+def _replica_set() -> Optional[ReplicaSet]:
+    if not settings.DATABASE_REPLICA_URLS:
+        return None
+    engines = [create_engine(url, **engine_options()) for url in settings.DATABASE_REPLICA_URLS]
+    return ReplicaSet(engines, settings.REPLICA_RETRY_SECONDS)
+
+
+replicas = _replica_set()
+def _primary_pins() -> PrimaryPins:
+    if settings.REPLICA_PIN_STORE != "redis":
+        return PrimaryPins(settings.REPLICA_PIN_SECONDS)
+    redis_url = settings.REPLICA_PIN_REDIS_URL or settings.RESPONSE_CACHE_URL
+    if not redis_url:
+        raise RuntimeError("REPLICA_PIN_STORE=redis requires REPLICA_PIN_REDIS_URL or RESPONSE_CACHE_URL")
+    return PrimaryPins(settings.REPLICA_PIN_SECONDS, redis_url=redis_url)
+
+
+primary_pins = _primary_pins()
+
+# Sessions for read-only routes; identical to SessionLocal when no replicas are configured
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replicas
+)
+
+# Async counterpart, created with the async engine on first use
+_async_replicas: Optional[ReplicaSet] = None
+_async_replica_engines: List[AsyncEngine] = []
+_async_lock = threading.Lock()
+AsyncReadSessionLocal = async_sessionmaker(
+    sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+)
+
+
+def configure_async_read_sessions() -> None:
+    global _async_replicas
+    with _async_lock:
+        if AsyncReadSessionLocal.kw.get("bind") is not None:
+            return
+        if settings.DATABASE_REPLICA_URLS:
+            _async_replica_engines.extend(
+                create_async_engine(async_url(url), **async_engine_options())
+                for url in settings.DATABASE_REPLICA_URLS
+            )
+            _async_replicas = ReplicaSet(
+                [replica.sync_engine for replica in _async_replica_engines],
+                settings.REPLICA_RETRY_SECONDS,
+            )
+        AsyncReadSessionLocal.configure(bind=get_async_engine(), replicas=_async_replicas)
+
+
+async def dispose_async_replicas() -> None:
+    for replica in _async_replica_engines:
+        await replica.dispose()
+
+
+def replica_stats() -> Dict[str, Any]:
+    return {
+        "replicas": replicas.stats() if replicas else [],
+        "pin_seconds": settings.REPLICA_PIN_SECONDS,
+        "pin_store": "redis" if primary_pins.shared else "memory",
+    }
@@ -3,6 +3,7 @@ from app.models.user import User, UserRole
 from app.models.category import Category
 from app.models.prompt import Prompt
 from app.core.security import get_password_hash
+from app.services.category import recount_prompts
 import random
 from datetime import datetime, timedelta
 
@@ -30,6 +31,9 @@ def seed_database(db: Session):
     
     db.commit()
     
+    # bcrypt is deliberately slow; every seeded account shares one hash
+    seed_password_hash = get_password_hash("password123")
+    
     # Create admin user if doesn't exist
     admin = User(
         email="admin@example.com",
@@ -49,7 +53,7 @@ def seed_database(db: Session):
         User(
             email="seller1@example.com",
             username="seller1",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="John Doe",
             role=UserRole.SELLER,
             is_active=True,
@@ -58,7 +62,7 @@ def seed_database(db: Session):
         User(
             email="seller2@example.com",
             username="seller2",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Jane Smith",
             role=UserRole.SELLER,
             is_active=True,
@@ -67,7 +71,7 @@ def seed_database(db: Session):
         User(
             email="seller3@example.com",
             username="seller3",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Mike Johnson",
             role=UserRole.SELLER,
             is_active=True,
@@ -76,7 +80,7 @@ def seed_database(db: Session):
         User(
             email="promptmaster@example.com",
             username="promptmaster",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Alex Turner",
             role=UserRole.SELLER,
             is_active=True,
@@ -85,7 +89,7 @@ def seed_database(db: Session):
         User(
             email="aiexpert@example.com",
             username="aiexpert",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Sarah Lee",
             role=UserRole.SELLER,
             is_active=True,
@@ -94,7 +98,7 @@ def seed_database(db: Session):
         User(
             email="wordsmith@example.com",
             username="wordsmith",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="David Chen",
             role=UserRole.SELLER,
             is_active=True,
@@ -103,7 +107,7 @@ def seed_database(db: Session):
         User(
             email="creativegenius@example.com",
             username="creativegenius",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Emily Rodriguez",
             role=UserRole.SELLER,
             is_active=True,
@@ -112,7 +116,7 @@ def seed_database(db: Session):
         User(
             email="techguru@example.com",
             username="techguru",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="James Wilson",
             role=UserRole.SELLER,
             is_active=True,
@@ -121,7 +125,7 @@ def seed_database(db: Session):
         User(
             email="contentcreator@example.com",
             username="contentcreator",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Sophia Patel",
             role=UserRole.SELLER,
             is_active=True,
@@ -130,7 +134,7 @@ def seed_database(db: Session):
         User(
             email="businesspro@example.com",
             username="businesspro",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Michael Brown",
             role=UserRole.SELLER,
             is_active=True,
@@ -147,7 +151,7 @@ def seed_database(db: Session):
         User(
             email="user1@example.com",
             username="user1",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Alice Brown",
             role=UserRole.USER,
             is_active=True,
@@ -156,7 +160,7 @@ def seed_database(db: Session):
         User(
             email="user2@example.com",
             username="user2",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Bob Wilson",
             role=UserRole.USER,
             is_active=True,
@@ -165,7 +169,7 @@ def seed_database(db: Session):
         User(
             email="user3@example.com",
             username="user3",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Carol Davis",
             role=UserRole.USER,
             is_active=True,
@@ -174,7 +178,7 @@ def seed_database(db: Session):
         User(
             email="maria@example.com",
             username="maria",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Maria Garcia",
             role=UserRole.USER,
             is_active=True,
@@ -183,7 +187,7 @@ def seed_database(db: Session):
         User(
             email="steven@example.com",
             username="steven",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Steven Taylor",
             role=UserRole.USER,
             is_active=True,
@@ -192,7 +196,7 @@ def seed_database(db: Session):
         User(
             email="lisa@example.com",
             username="lisa",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Lisa Wong",
             role=UserRole.USER,
             is_active=True,
@@ -201,7 +205,7 @@ def seed_database(db: Session):
         User(
             email="thomas@example.com",
             username="thomas",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Thomas Martinez",
             role=UserRole.USER,
             is_active=True,
@@ -210,7 +214,7 @@ def seed_database(db: Session):
         User(
             email="jennifer@example.com",
             username="jennifer",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Jennifer Moore",
             role=UserRole.USER,
             is_active=True,
@@ -219,7 +223,7 @@ def seed_database(db: Session):
         User(
             email="daniel@example.com",
             username="daniel",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Daniel Lewis",
             role=UserRole.USER,
             is_active=True,
@@ -228,7 +232,7 @@ def seed_database(db: Session):
         User(
             email="rebecca@example.com",
             username="rebecca",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Rebecca Jackson",
             role=UserRole.USER,
             is_active=True,
@@ -237,7 +241,7 @@ def seed_database(db: Session):
         User(
             email="kevin@example.com",
             username="kevin",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Kevin White",
             role=UserRole.USER,
             is_active=True,
@@ -246,7 +250,7 @@ def seed_database(db: Session):
         User(
             email="nicole@example.com",
             username="nicole",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Nicole Clark",
             role=UserRole.USER,
             is_active=True,
@@ -255,7 +259,7 @@ def seed_database(db: Session):
         User(
             email="ryan@example.com",
             username="ryan",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Ryan Scott",
             role=UserRole.USER,
             is_active=True,
@@ -264,7 +268,7 @@ def seed_database(db: Session):
         User(
             email="amanda@example.com",
             username="amanda",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Amanda Lee",
             role=UserRole.USER,
             is_active=True,
@@ -273,7 +277,7 @@ def seed_database(db: Session):
         User(
             email="gregory@example.com",
             username="gregory",
-            hashed_password=get_password_hash("password123"),
+            hashed_password=seed_password_hash,
             full_name="Gregory Adams",
             role=UserRole.USER,
             is_active=True,
@@ -710,4 +714,7 @@ def seed_database(db: Session):
         
         db.add(prompt)
     
-    db.commit()
\ No newline at end of file
+    db.commit()
+    
+    # Prompts were inserted directly, so bring the denormalized counts in line
+    recount_prompts(db)
\ No newline at end of file
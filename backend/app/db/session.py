@@ -1,11 +1,170 @@
-from typing import Generator
-from sqlalchemy.orm import Session
+import threading
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Optional
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._stats_lock = threading.Lock()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+
+def engine_options() -> Dict[str, Any]:
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer owns pooling in transaction mode; holding idle connections
+        # here would only pin server connections, so open one per checkout
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options())
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-from app.db.base import SessionLocal
 
 def get_db() -> Generator[Session, None, None]:
+    """Request-scoped session dependency"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+# Async engine for the asyncpg read path. Created on first use so asyncpg is
+# only required when some route is configured to use it.
+_async_engine: Optional[AsyncEngine] = None
+_async_engine_lock = threading.Lock()
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def async_url(url: str):
+    """The same database URL with the asyncpg driver"""
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def async_engine_options() -> Dict[str, Any]:
+    options = engine_options()
+    if settings.DB_PGBOUNCER_MODE:
+        # asyncpg's prepared statement cache breaks under transaction pooling
+        options["connect_args"] = {"statement_cache_size": 0}
+    else:
+        # The async engine needs its asyncio-aware queue pool
+        del options["poolclass"]
+    return options
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    with _async_engine_lock:
+        if _async_engine is None:
+            url = settings.ASYNC_DATABASE_URL or async_url(settings.DATABASE_URL)
+            _async_engine = create_async_engine(url, **async_engine_options())
+            AsyncSessionLocal.configure(bind=_async_engine)
+        return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections, if it was ever created"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped AsyncSession dependency"""
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+class SessionRunner:
+    """
+    Runs a sync, Session-based function either on a worker thread with a
+    regular Session, or on an AsyncSession via run_sync. In the async case
+    the function runs on the event loop (asyncpg I/O is awaited through
+    greenlets), so a request no longer holds a threadpool slot while it
+    waits on Postgres. Either way the existing services run unchanged.
+    """
+
+    def __init__(self, db: Optional[Session] = None, async_db: Optional[AsyncSession] = None):
+        self.db = db
+        self.async_db = async_db
+
+    @property
+    def is_async(self) -> bool:
+        return self.async_db is not None
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call fn(session, *args, **kwargs); keep any ORM access (e.g. serialization) inside fn"""
+        if self.async_db is not None:
+            return await self.async_db.run_sync(fn, *args, **kwargs)
+        return await run_in_threadpool(fn, self.db, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Live connection pool statistics for this worker process"""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__, "pgbouncer_mode": settings.DB_PGBOUNCER_MODE}
+
+    stats: Dict[str, Any] = {
+        "pool": type(pool).__name__,
+        "pgbouncer_mode": settings.DB_PGBOUNCER_MODE,
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # Negative while the pool is still filling up to `size`
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            avg_wait_seconds=pool.total_wait / pool.checkouts if pool.checkouts else 0.0,
+            max_wait_seconds=pool.max_wait,
+        )
+    if _async_engine is not None and isinstance(_async_engine.pool, QueuePool):
+        async_pool = _async_engine.pool
+        stats["async"] = {
+            "size": async_pool.size(),
+            "checked_in": async_pool.checkedin(),
+            "checked_out": async_pool.checkedout(),
+            "overflow": async_pool.overflow(),
+        }
+    return stats
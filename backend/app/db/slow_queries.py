@@ -0,0 +1,178 @@
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.query_stats import current_stats
+
+logger = logging.getLogger(__name__)
+
+# Execution option set on our own EXPLAIN statements so they are not logged in turn
+SKIP_OPTION = "skip_slow_query_log"
+
+# conn.info key of the running statement's start time
+STARTED_KEY = "slow_query_started"
+
+# EXPLAIN ANALYZE executes the statement, so only plain reads are ever explained
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|FOR\s+UPDATE|FOR\s+SHARE)\b", re.IGNORECASE)
+
+MAX_STATEMENT_CHARS = 4000
+MAX_PENDING_EXPLAINS = 8
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Types of the bound parameters, never their values"""
+    if executemany and parameters:
+        return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _service_function() -> Optional[str]:
+    """Innermost app.services function on the current stack"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.services."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """
+    Bounded in-memory log of statements slower than the threshold. A sample
+    of slow read-only statements is re-run on a background thread under
+    EXPLAIN (ANALYZE, BUFFERS) and the plan is attached to the entry.
+    """
+
+    def __init__(self, threshold_ms: float, max_entries: int, sample_rate: float):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self._pending_explains = 0
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+    def install(self) -> None:
+        event.listen(Engine, "before_cursor_execute", self._before)
+        event.listen(Engine, "after_cursor_execute", self._after)
+        event.listen(Engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info[STARTED_KEY] = time.perf_counter()
+
+    def _error(self, context) -> None:
+        # Failed statements never reach _after
+        if context.connection is not None:
+            context.connection.info.pop(STARTED_KEY, None)
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop(STARTED_KEY, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < self.threshold:
+            return
+        if context is not None and context.execution_options.get(SKIP_OPTION):
+            return
+
+        stats = current_stats()
+        entry = {
+            "at": datetime.utcnow().isoformat(),
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": statement[:MAX_STATEMENT_CHARS],
+            "parameters": parameter_shape(parameters, executemany),
+            "route": stats.route if stats else None,
+            "service": _service_function(),
+            "plan": None,
+        }
+        with self._lock:
+            self.entries.append(entry)
+        logger.warning(
+            "Slow query (%.0f ms) on %s from %s: %s",
+            entry["duration_ms"], entry["route"], entry["service"], entry["statement"][:200],
+        )
+
+        if not executemany and self._should_explain(conn, statement):
+            entry["plan"] = "pending"
+            self._explainer.submit(self._explain, entry, statement, parameters)
+
+    def _should_explain(self, conn, statement: str) -> bool:
+        from app.db.session import engine
+        if random.random() >= self.sample_rate:
+            return False
+        if conn.dialect.name != "postgresql" or conn.dialect.driver != engine.dialect.driver:
+            # Parameters are in the executing driver's format; only replay on a matching engine
+            return False
+        if not _READ_ONLY.match(statement) or _WRITES.search(statement):
+            return False
+        with self._lock:
+            if self._pending_explains >= MAX_PENDING_EXPLAINS:
+                return False
+            self._pending_explains += 1
+        return True
+
+    def _explain(self, entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+        from app.db.session import engine
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(**{SKIP_OPTION: True})
+                with conn.begin() as transaction:
+                    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.SLOW_QUERY_EXPLAIN_TIMEOUT_MS)}")
+                    rows = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                    entry["plan"] = "\n".join(row[0] for row in rows)
+                    transaction.rollback()
+        except Exception as exc:
+            entry["plan"] = None
+            entry["explain_error"] = str(exc).splitlines()[0]
+        finally:
+            with self._lock:
+                self._pending_explains -= 1
+
+    def shutdown(self) -> None:
+        """Drop EXPLAINs that have not started; wait for the running one"""
+        self._explainer.shutdown(wait=True, cancel_futures=True)
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Newest entries first"""
+        with self._lock:
+            return list(reversed(self.entries))[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+    def dump(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """Append all entries to a JSON-lines file"""
+        path = path or settings.SLOW_QUERY_DUMP_PATH
+        with self._lock:
+            entries = list(self.entries)
+        with open(path, "a", encoding="utf-8") as dump_file:
+            for entry in entries:
+                dump_file.write(json.dumps(entry) + "\n")
+        return {"path": path, "entries": len(entries)}
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    max_entries=settings.SLOW_QUERY_MAX_ENTRIES,
+    sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+)
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_log.install()
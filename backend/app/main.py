@@ -1,15 +1,52 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.middleware import CompressionMiddleware, MetricsMiddleware, QueryStatsMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
+from app.core.metrics import render_metrics
+from app.core.hashing import HashPoolSaturated, password_hash_pool
+from app.db.routing import dispose_async_replicas
+from app.db.session import dispose_async_engine
+from app.db.slow_queries import slow_query_log
+from app.services.view_counter import view_buffer
 from datetime import datetime
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    view_buffer.start()
+    yield
+    # Write out buffered view counts before the worker exits
+    view_buffer.stop()
+    password_hash_pool.shutdown()
+    slow_query_log.shutdown()
+    await dispose_async_engine()
+    await dispose_async_replicas()
+
 app = FastAPI(
     title="Prompt Share API",
     description="API for the Prompt Share marketplace",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Compress responses (innermost, so request metrics include compression time)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY if settings.BROTLI_ENABLED else None,
 )
 
+# Count SQL statements per request (X-DB-* headers in debug mode)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request count/latency metrics per route template
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -19,6 +56,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(HashPoolSaturated)
+async def hash_pool_saturated_handler(request: Request, exc: HashPoolSaturated):
+    # Login/register bursts are shed quickly instead of starving other routes
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many authentication requests, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -52,6 +98,12 @@ async def api_health_check():
         ]
     }
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        content, content_type = render_metrics()
+        return Response(content=content, media_type=content_type)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -9,6 +9,8 @@ class Category(Base):
     description = Column(Text)
     slug = Column(String, unique=True, index=True, nullable=False)
     is_active = Column(Boolean, default=True)
+    # Number of active prompts, maintained by the prompt service on writes
+    prompts_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     prompts = relationship("Prompt", back_populates="category")
\ No newline at end of file
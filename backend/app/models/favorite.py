@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
 
 class Favorite(Base):
     __tablename__ = "favorite"
+    __table_args__ = (
+        Index("ix_favorite_user_id_prompt_id", "user_id", "prompt_id"),
+        Index("ix_favorite_prompt_id", "prompt_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Enum, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Enum, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
 from app.models.enums import OrderStatus
 
 class Order(Base):
+    __table_args__ = (
+        # has_purchased_prompt and the viewer's purchased flags
+        Index("ix_order_user_id_prompt_id_status", "user_id", "prompt_id", "status"),
+        Index("ix_order_prompt_id", "prompt_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String, unique=True, index=True, nullable=False)
     amount = Column(Float, nullable=False)
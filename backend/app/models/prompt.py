@@ -1,9 +1,32 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 
 from app.db.base import Base
 
+# Text search configuration used for both the stored vector and incoming queries
+SEARCH_CONFIG = "english"
+
+# Weighted search document: title (A) ranks above description (B) above content (C)
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+)
+
 class Prompt(Base):
+    __table_args__ = (
+        Index("ix_prompt_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_prompt_seller_id", "seller_id"),
+        # Listings filter on is_active and order by (sort column, id)
+        Index("ix_prompt_active_category_created_at", "category_id", "created_at", "id", postgresql_where=text("is_active")),
+        Index("ix_prompt_active_created_at", "created_at", "id", postgresql_where=text("is_active")),
+        Index("ix_prompt_active_price", "price", "id", postgresql_where=text("is_active")),
+        Index("ix_prompt_active_rating", "rating", "id", postgresql_where=text("is_active")),
+        Index("ix_prompt_active_sales_count", "sales_count", "id", postgresql_where=text("is_active")),
+        Index("ix_prompt_active_views_count", "views_count", "id", postgresql_where=text("is_active")),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
     description = Column(Text)
@@ -12,9 +35,21 @@ class Prompt(Base):
     price = Column(Float, nullable=False)
     is_active = Column(Boolean, default=True)
     is_featured = Column(Boolean, default=False)
-    views_count = Column(Integer, default=0)
-    sales_count = Column(Integer, default=0)
-    rating = Column(Float, default=0.0)
+    # Sort columns are NOT NULL: keyset cursors cannot seek past a NULL position
+    views_count = Column(Integer, nullable=False, default=0, server_default="0")
+    sales_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating = Column(Float, nullable=False, default=0.0, server_default="0")
+    created_at = Column(DateTime, nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    
+    # Running review aggregates, updated in the same transaction as each review write;
+    # rating_<n>_count holds reviews whose rating floors to n stars
+    rating_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    rating_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Fields for sequence prompts
     is_sequence = Column(Boolean, default=False)
@@ -22,6 +57,9 @@ class Prompt(Base):
     order_index = Column(Integer, default=0)
     step_content = Column(Text, nullable=True)
     
+    # Full-text search vector, maintained by Postgres as a stored generated column
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
+    
     # Foreign Keys
     seller_id = Column(Integer, ForeignKey("user.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("category.id"), nullable=False)
@@ -35,4 +73,9 @@ class Prompt(Base):
     favorites = relationship("Favorite", back_populates="prompt")
     
     # Self-referential relationship for sequence prompts
-    parent = relationship("Prompt", remote_side=[id], backref="steps") 
\ No newline at end of file
+    parent = relationship("Prompt", remote_side=[id], backref="steps")
+    
+    @property
+    def rating_histogram(self) -> dict:
+        """Review counts keyed by star (1-5)"""
+        return {star: getattr(self, f"rating_{star}_count") or 0 for star in range(1, 6)} 
\ No newline at end of file
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.db.base import Base
 
 class Review(Base):
+    __table_args__ = (
+        Index("ix_review_prompt_id", "prompt_id"),
+        Index("ix_review_user_id_prompt_id", "user_id", "prompt_id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     rating = Column(Float, nullable=False)
     comment = Column(Text)
@@ -16,4 +21,13 @@ class Review(Base):
     
     # Relationships
     user = relationship("User", back_populates="reviews")
-    prompt = relationship("Prompt", back_populates="reviews")
\ No newline at end of file
+    prompt = relationship("Prompt", back_populates="reviews")
+    
+    # Flattened author fields for ReviewWithUser; load `user` eagerly when listing
+    @property
+    def user_username(self) -> str:
+        return self.user.username
+    
+    @property
+    def user_full_name(self) -> str:
+        return self.user.full_name
@@ -0,0 +1,28 @@
+from typing import Any, List
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from app.schemas.order import OrderResponse
+from app.schemas.prompt import PromptInDB
+from app.schemas.review import ReviewWithUser
+
+# Building a TypeAdapter compiles a validator and serializer, so the hot
+# response shapes are built once at import and reused for every request.
+prompt_adapter = TypeAdapter(PromptInDB)
+review_list_adapter = TypeAdapter(List[ReviewWithUser])
+order_adapter = TypeAdapter(OrderResponse)
+order_list_adapter = TypeAdapter(List[OrderResponse])
+
+
+def dump_json(adapter: TypeAdapter, value: Any) -> bytes:
+    """Validate ORM objects (or dicts) against the adapter's type and serialize to JSON in one pass"""
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def json_response(adapter: TypeAdapter, value: Any, status_code: int = 200) -> Response:
+    """
+    Response serialized by the adapter. Returning a Response skips FastAPI's
+    second validation against response_model, which stays for the docs.
+    """
+    return Response(dump_json(adapter, value), status_code=status_code, media_type="application/json")
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Literal, Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 from app.models.prompt import Prompt
@@ -48,9 +48,38 @@ class PromptInDB(PromptBase):
     views_count: int
     sales_count: int
     rating: float
+    rating_count: int = 0
+    rating_histogram: Dict[int, int] = Field(default_factory=dict, description="Review counts by star (1-5)")
     created_at: datetime
     updated_at: datetime
     is_favorited: Optional[bool] = None
+    is_purchased: Optional[bool] = None
+    is_reviewed: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+class PromptSummary(BaseModel):
+    """Compact card representation used by listings; omits the heavy Text columns"""
+    id: int
+    title: str
+    description: Optional[str] = None
+    price: float
+    category_id: int
+    seller_id: int
+    seller: UserBase
+    is_active: bool
+    is_featured: bool
+    is_sequence: Optional[bool] = False
+    views_count: int
+    sales_count: int
+    rating: float
+    rating_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+    is_favorited: Optional[bool] = None
+    is_purchased: Optional[bool] = None
+    is_reviewed: Optional[bool] = None
 
     class Config:
         from_attributes = True
@@ -73,6 +102,10 @@ class PromptStepInDB(PromptStepBase):
     class Config:
         from_attributes = True
 
+SearchMode = Literal["substring", "fulltext"]
+CountStrategy = Literal["exact", "cached", "estimate"]
+PromptView = Literal["summary", "full"]
+
 class PromptFilter(BaseModel):
     category_id: Optional[int] = None
     min_price: Optional[float] = None
@@ -80,14 +113,53 @@ class PromptFilter(BaseModel):
     is_featured: Optional[bool] = None
     is_sequence: Optional[bool] = None
     search: Optional[str] = None
-    sort_by: Optional[str] = Field(None, description="Sort by: price, rating, sales, views")
+    search_mode: SearchMode = Field("substring", description="Search mode: substring or fulltext")
+    sort_by: Optional[str] = Field(
+        None, description="Sort by: created_at, price, rating, sales_count, views_count, relevance"
+    )
     sort_order: Optional[str] = Field("desc", description="Sort order: asc or desc")
     page: int = Field(1, ge=1)
     page_size: int = Field(10, ge=1, le=100)
+    cursor: Optional[str] = Field(None, description="Opaque keyset cursor; takes precedence over page")
+    count_strategy: CountStrategy = Field("exact", description="Total count: exact, cached or estimate")
+    view: PromptView = Field("summary", description="Item shape: summary (cards) or full")
+    include_facets: bool = Field(False, description="Also return facet counts for the filtered set")
 
-class PromptResponse(BaseModel):
-    items: List[PromptInDB]
+class CategoryFacet(BaseModel):
+    category_id: int
+    count: int
+
+class PriceBucketFacet(BaseModel):
+    min_price: float
+    max_price: Optional[float] = None  # None for the open-ended top bucket
+    count: int
+
+class FlagFacet(BaseModel):
+    value: bool
+    count: int
+
+class RatingBandFacet(BaseModel):
+    min_rating: int
+    count: int
+
+class PromptFacets(BaseModel):
+    categories: List[CategoryFacet]
+    price_buckets: List[PriceBucketFacet]
+    featured: List[FlagFacet]
+    sequence: List[FlagFacet]
+    rating_bands: List[RatingBandFacet]
+
+class PromptPageBase(BaseModel):
     total: int
     page: int
     page_size: int
-    total_pages: int 
\ No newline at end of file
+    total_pages: int
+    next_cursor: Optional[str] = None
+    total_is_exact: bool = True
+    facets: Optional[PromptFacets] = None
+
+class PromptResponse(PromptPageBase):
+    items: List[PromptInDB]
+
+class PromptSummaryResponse(PromptPageBase):
+    items: List[PromptSummary]
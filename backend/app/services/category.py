@@ -1,5 +1,7 @@
 from typing import List, Optional
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
+from app.core.cache import response_cache, CATEGORIES_TAG
 from app.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
@@ -33,6 +35,7 @@ def create_category(
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
+    response_cache.invalidate_tags(CATEGORIES_TAG)
     return db_category
 
 def update_category(
@@ -51,6 +54,7 @@ def update_category(
     
     db.commit()
     db.refresh(category)
+    response_cache.invalidate_tags(CATEGORIES_TAG)
     return category
 
 def delete_category(
@@ -64,13 +68,35 @@ def delete_category(
     
     db.delete(category)
     db.commit()
+    response_cache.invalidate_tags(CATEGORIES_TAG)
     return True
 
-def get_category_prompts_count(db: Session, category_id: int) -> int:
-    """Get the number of prompts in a category"""
+def adjust_prompts_count(db: Session, category_id: int, delta: int) -> None:
+    """
+    Atomically add `delta` to a category's active prompt count. Runs in the
+    caller's transaction, so it commits together with the prompt write.
+    """
+    if not delta:
+        return
+    db.execute(
+        update(Category)
+        .where(Category.id == category_id)
+        .values(prompts_count=Category.prompts_count + delta),
+        execution_options={"synchronize_session": False},
+    )
+
+def recount_prompts(db: Session, category_id: Optional[int] = None) -> int:
+    """Recompute prompts_count from the prompt table; returns the number of categories updated"""
     from app.models.prompt import Prompt
-    return (
-        db.query(Prompt)
-        .filter(Prompt.category_id == category_id)
-        .count()
-    )
\ No newline at end of file
+    active_count = (
+        select(func.count(Prompt.id))
+        .where(Prompt.category_id == Category.id, Prompt.is_active.is_(True))
+        .scalar_subquery()
+    )
+    stmt = update(Category).values(prompts_count=active_count)
+    if category_id is not None:
+        stmt = stmt.where(Category.id == category_id)
+    result = db.execute(stmt, execution_options={"synchronize_session": False})
+    db.commit()
+    response_cache.invalidate_tags(CATEGORIES_TAG)
+    return result.rowcount
\ No newline at end of file
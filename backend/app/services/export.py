@@ -0,0 +1,130 @@
+import csv
+import io
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.db.routing import ReadSessionLocal
+from app.models.enums import SubscriptionPlan, SubscriptionStatus
+from app.models.order import Order
+from app.models.prompt import Prompt
+from app.models.subscription import Subscription
+
+# Rows fetched per round trip from the server-side cursor, and written per chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Catalog metadata only; the paid prompt content is never exported
+CATALOG_COLUMNS = (
+    Prompt.id, Prompt.title, Prompt.description, Prompt.price, Prompt.category_id,
+    Prompt.seller_id, Prompt.is_featured, Prompt.is_sequence, Prompt.parent_id,
+    Prompt.rating, Prompt.rating_count, Prompt.sales_count, Prompt.views_count,
+    Prompt.created_at, Prompt.updated_at,
+)
+
+SELLER_ORDER_COLUMNS = (
+    Order.id, Order.order_number, Order.prompt_id, Prompt.title.label("prompt_title"),
+    Order.amount, Order.sol_amount, Order.payment_type, Order.status,
+    Order.created_at, Order.updated_at,
+)
+
+
+def has_active_plan(db: Session, user_id: int, plan: SubscriptionPlan) -> bool:
+    """Whether the user has a current, active subscription to plan"""
+    now = datetime.utcnow()
+    return db.query(
+        db.query(Subscription).filter(
+            Subscription.user_id == user_id,
+            Subscription.plan == plan,
+            Subscription.status == SubscriptionStatus.ACTIVE,
+            Subscription.start_date <= now,
+            Subscription.end_date > now,
+        ).exists()
+    ).scalar()
+
+
+def can_export_catalog(db: Session, user_id: int) -> bool:
+    return has_active_plan(db, user_id, SubscriptionPlan.ENTERPRISE)
+
+
+def catalog_query(after_id: int = 0) -> Select:
+    """Active prompts in id order, starting after after_id"""
+    return (
+        select(*CATALOG_COLUMNS)
+        .where(Prompt.is_active == True, Prompt.id > after_id)
+        .order_by(Prompt.id)
+    )
+
+
+def seller_orders_query(seller_id: int, after_id: int = 0) -> Select:
+    """Orders for the seller's prompts in id order, starting after after_id"""
+    return (
+        select(*SELLER_ORDER_COLUMNS)
+        .join(Prompt, Prompt.id == Order.prompt_id)
+        .where(Prompt.seller_id == seller_id, Order.id > after_id)
+        .order_by(Order.id)
+    )
+
+
+def stream_rows(query: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence[Any]]:
+    """
+    Batches of plain rows from a server-side cursor. Columns are selected
+    rather than entities, so nothing enters an identity map and memory stays
+    bounded by one batch. The generator owns its session: a streaming
+    response outlives the request-scoped one.
+    """
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+        for rows in result.partitions():
+            yield rows
+    finally:
+        db.close()
+
+
+def _value(value: Any) -> Any:
+    # Enums export as their value; orjson handles datetimes itself
+    return getattr(value, "value", value)
+
+
+def _csv_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else _value(value)
+
+
+def ndjson_chunks(query: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """One JSON object per line, one chunk per batch"""
+    keys: Optional[List[str]] = None
+    for rows in stream_rows(query, batch_size):
+        if keys is None:
+            keys = list(rows[0]._fields)
+        yield b"".join(
+            orjson.dumps({key: _value(value) for key, value in zip(keys, row)}, option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+
+def csv_chunks(query: Select, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """A header line, then one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.key for column in query.selected_columns)
+    for rows in stream_rows(query, batch_size):
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_chunks(query: Select, format: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    if format == "csv":
+        return csv_chunks(query, batch_size)
+    return ndjson_chunks(query, batch_size)
@@ -2,8 +2,11 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
+from app.db.routing import primary_pins
 from app.models.favorite import Favorite
 from app.models.prompt import Prompt
+from app.services.prompt import listing_options
+from app.services.viewer_state import ViewerStateLoader
 
 
 def add_favorite(db: Session, user_id: int, prompt_id: int) -> Favorite:
@@ -21,6 +24,7 @@ def add_favorite(db: Session, user_id: int, prompt_id: int) -> Favorite:
     db.add(db_favorite)
     db.commit()
     db.refresh(db_favorite)
+    primary_pins.pin(user_id)
     return db_favorite
 
 
@@ -35,6 +39,7 @@ def remove_favorite(db: Session, user_id: int, prompt_id: int) -> bool:
     
     db.delete(favorite)
     db.commit()
+    primary_pins.pin(user_id)
     return True
 
 
@@ -42,11 +47,13 @@ def get_user_favorites(
     db: Session, 
     user_id: int, 
     skip: int = 0, 
-    limit: int = 100
+    limit: int = 100,
+    view: Optional[str] = "summary"
 ) -> List[Prompt]:
-    """Get all prompts that a user has favorited"""
+    """Get all prompts that a user has favorited, with the user's viewer flags"""
     favorites = (
         db.query(Prompt)
+        .options(*listing_options(view))
         .join(Favorite, Favorite.prompt_id == Prompt.id)
         .filter(Favorite.user_id == user_id)
         .offset(skip)
@@ -54,7 +61,7 @@ def get_user_favorites(
         .all()
     )
     
-    return favorites
+    return ViewerStateLoader(db, user_id).apply(favorites)
 
 
 def is_favorited(db: Session, user_id: int, prompt_id: int) -> bool:
@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
+from app.db.routing import primary_pins
 from app.models.order import Order
 from app.models.payment import Payment, PaymentMethod, PaymentStatus
 from app.models.enums import OrderStatus
@@ -28,6 +29,7 @@ def create_order(db: Session, order_data: OrderCreate, user_id: int) -> Order:
     db.add(db_order)
     db.commit()
     db.refresh(db_order)
+    primary_pins.pin(user_id)
     return db_order
 
 def create_payment(db: Session, payment_data: PaymentCreate, order_id: int) -> Payment:
@@ -106,6 +108,8 @@ def update_order_status(db: Session, order_id: int, status: OrderStatus) -> Opti
     order.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(order)
+    # A paid order flips the buyer's purchase flags; keep their reads consistent
+    primary_pins.pin(order.user_id)
     return order
 
 def update_payment_status(db: Session, payment_id: int, status: PaymentStatus) -> Optional[Payment]:
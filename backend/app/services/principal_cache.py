@@ -0,0 +1,68 @@
+import threading
+from typing import Any, Dict, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+# Column attributes copied into a cached snapshot; the password hash is never cached
+USER_COLUMNS = tuple(
+    attr.key for attr in inspect(User).column_attrs if attr.key != "hashed_password"
+)
+
+
+class PrincipalCache:
+    """
+    Short-lived cache of authenticated users, keyed by user id and token `iat`.
+
+    Entries hold plain column values; each hit builds a fresh transient `User`,
+    so callers can read attributes as usual but must not rely on lazy-loaded
+    relationships or add the snapshot to a session. Invalidation bumps a
+    per-user generation that is part of the key, which retires every cached
+    token of that user at once. The cache is per process: other workers see
+    a change once their entry expires (at most the TTL).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._cache.ttl_seconds > 0
+
+    def get_user(self, db: Session, user_id: int, issued_at: Any = None) -> Optional[User]:
+        """Return a User snapshot for the token subject, loading it from the database on a miss"""
+        if not self.enabled:
+            return db.query(User).filter(User.id == user_id).first()
+
+        # Read the generation before loading so a concurrent invalidation wins
+        key = (user_id, issued_at, self._generations.get(user_id, 0))
+        columns = self._cache.get(key)
+        if columns is None:
+            user = db.query(User).filter(User.id == user_id).first()
+            if user is None:
+                return None
+            columns = {name: getattr(user, name) for name in USER_COLUMNS}
+            self._cache.set(key, columns)
+        return User(**columns)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop every cached snapshot of a user; call after committing a change to them"""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "ttl_seconds": self._cache.ttl_seconds}
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -1,89 +1,378 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, desc, asc
-from app.models.prompt import Prompt
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy import or_, and_, desc, asc, cast, func, tuple_, select, case
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from app.core.cache import response_cache, PROMPTS_TAG, CATEGORIES_TAG, prompt_tag
+from app.core.config import settings
+from app.db.explain import Explain, plan_of
+from app.db.routing import primary_pins
+from app.models.prompt import Prompt, SEARCH_CONFIG
+from app.models.user import User
 from app.schemas.prompt import PromptFilter, PromptCreate, PromptUpdate
+from app.services.view_counter import view_buffer
+from app.services.viewer_state import ViewerStateLoader
+from app.services.category import adjust_prompts_count
 
-def get_prompts(
-    db: Session,
-    filter_params: PromptFilter,
-    user_id: Optional[int] = None,
-) -> tuple[List[Prompt], int]:
+# Columns that can be used for sorting (and therefore as keyset cursor keys)
+SORT_COLUMNS = {
+    "created_at": Prompt.created_at,
+    "price": Prompt.price,
+    "rating": Prompt.rating,
+    "sales_count": Prompt.sales_count,
+    "views_count": Prompt.views_count,
+}
+
+# Short names accepted by the API for backwards compatibility
+SORT_ALIASES = {
+    "sales": "sales_count",
+    "views": "views_count",
+}
+
+# Columns rendered by PromptSummary; list views load only these
+SUMMARY_COLUMNS = (
+    Prompt.id,
+    Prompt.title,
+    Prompt.description,
+    Prompt.price,
+    Prompt.category_id,
+    Prompt.seller_id,
+    Prompt.is_active,
+    Prompt.is_featured,
+    Prompt.is_sequence,
+    Prompt.views_count,
+    Prompt.sales_count,
+    Prompt.rating,
+    Prompt.rating_count,
+    Prompt.created_at,
+    Prompt.updated_at,
+)
+
+# Upper bounds (exclusive) of the price facet buckets; the last bucket is open-ended
+PRICE_BUCKET_EDGES = (10, 20, 30, 50, 100)
+
+class PromptPage(NamedTuple):
+    """A page of prompts; unpacks like the (prompts, total_count) tuple it replaces"""
+    items: List[Prompt]
+    total: int
+    next_cursor: Optional[str] = None
+    total_is_exact: bool = True
+
+def listing_options(view: Optional[str] = "summary") -> tuple:
+    """
+    Loader options for prompt lists. The summary view skips the large Text
+    columns (content, preview_result, step_content) and loads only the
+    seller fields shown on a card; view="full" loads everything.
+    """
+    if view == "full":
+        return (joinedload(Prompt.seller),)
+    return (
+        load_only(*SUMMARY_COLUMNS),
+        joinedload(Prompt.seller).load_only(User.username, User.full_name),
+    )
+
+def _resolve_sort_key(sort_by: Optional[str]) -> str:
+    sort_by = SORT_ALIASES.get(sort_by, sort_by)
+    return sort_by if sort_by in SORT_COLUMNS else "created_at"
+
+def encode_cursor(sort_key: str, sort_order: str, prompt: Prompt) -> str:
+    """
+    Encode the position after `prompt` as an opaque, URL-safe cursor.
+    Raises ValueError if the sort value is NULL, which a seek cannot get past.
+    """
+    value = getattr(prompt, sort_key)
+    if value is None:
+        raise ValueError(f"Cannot encode a cursor at a NULL {sort_key}")
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"k": sort_key, "o": sort_order, "v": value, "id": prompt.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_key: str, sort_order: str) -> tuple[Any, int]:
     """
-    Get prompts with filtering, searching, and pagination
-    Returns tuple of (prompts, total_count)
+    Decode a cursor produced by encode_cursor into (sort value, prompt id).
+    Raises ValueError if the cursor is malformed or was issued for a different sort.
     """
-    query = db.query(Prompt).options(joinedload(Prompt.seller)).filter(Prompt.is_active == True)
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        key, order, value, last_id = payload["k"], payload["o"], payload["v"], int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if value is None:
+        raise ValueError("Invalid cursor")
+
+    if key != sort_key or order != sort_order:
+        raise ValueError("Cursor does not match the requested sort")
+    if key == "created_at":
+        value = datetime.fromisoformat(value)
+    return value, last_id
+
+def _filter_conditions(filter_params: PromptFilter) -> tuple[list, Any]:
+    """Build the WHERE conditions for a listing, plus the tsquery when full-text searching"""
+    conditions = [Prompt.is_active == True]
 
     # Apply filters
     if filter_params.category_id:
-        query = query.filter(Prompt.category_id == filter_params.category_id)
+        conditions.append(Prompt.category_id == filter_params.category_id)
     
     if filter_params.min_price is not None:
-        query = query.filter(Prompt.price >= filter_params.min_price)
+        conditions.append(Prompt.price >= filter_params.min_price)
     
     if filter_params.max_price is not None:
-        query = query.filter(Prompt.price <= filter_params.max_price)
+        conditions.append(Prompt.price <= filter_params.max_price)
     
     if filter_params.is_featured is not None:
-        query = query.filter(Prompt.is_featured == filter_params.is_featured)
+        conditions.append(Prompt.is_featured == filter_params.is_featured)
+    
+    if filter_params.is_sequence is not None:
+        conditions.append(Prompt.is_sequence == filter_params.is_sequence)
     
     # Apply search
+    ts_query = None
     if filter_params.search:
-        search_term = f"%{filter_params.search}%"
-        query = query.filter(
-            or_(
-                Prompt.title.ilike(search_term),
-                Prompt.description.ilike(search_term),
-                Prompt.content.ilike(search_term)
+        if filter_params.search_mode == "substring":
+            search_term = f"%{filter_params.search}%"
+            conditions.append(
+                or_(
+                    Prompt.title.ilike(search_term),
+                    Prompt.description.ilike(search_term),
+                    Prompt.content.ilike(search_term)
+                )
             )
-        )
-
-    # Apply sorting
-    if filter_params.sort_by:
-        sort_column = getattr(Prompt, filter_params.sort_by, Prompt.created_at)
-        if filter_params.sort_order == "asc":
-            query = query.order_by(asc(sort_column))
         else:
-            query = query.order_by(desc(sort_column))
-    else:
-        # Default sorting by created_at desc
-        query = query.order_by(desc(Prompt.created_at))
+            # Full-text search served by the GIN index on search_vector
+            ts_query = func.websearch_to_tsquery(cast(SEARCH_CONFIG, REGCONFIG), filter_params.search)
+            conditions.append(Prompt.search_vector.bool_op("@@")(ts_query))
+
+    return conditions, ts_query
+
+def filter_cache_key(filter_params: PromptFilter) -> str:
+    """Normalized key identifying the filtered set, independent of sorting and paging"""
+    data = filter_params.model_dump(
+        include={"category_id", "min_price", "max_price", "is_featured", "is_sequence", "search", "search_mode"}
+    )
+    if data["search"]:
+        data["search"] = " ".join(data["search"].lower().split())
+    return json.dumps(data, sort_keys=True)
+
+def _estimate_count(db: Session, conditions: list) -> Optional[int]:
+    """Row estimate from the Postgres planner, or None if unavailable"""
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        return None
+    plan = plan_of(db.execute(Explain(select(Prompt.id).where(*conditions))))
+    return int(plan["Plan Rows"])
+
+def count_prompts(db: Session, filter_params: PromptFilter, conditions: list) -> tuple[int, bool]:
+    """
+    Count the prompts matching `conditions` using filter_params.count_strategy:
+    exact (COUNT query), cached (exact, kept in the response cache per filter) or
+    estimate (planner estimate for large results, exact below the threshold).
+    Returns (total, is_exact).
+    """
+    strategy = filter_params.count_strategy
+
+    if strategy == "estimate":
+        estimate = _estimate_count(db, conditions)
+        if estimate is not None and estimate >= settings.PROMPT_COUNT_ESTIMATE_THRESHOLD:
+            return estimate, False
+
+    if strategy == "cached":
+        key = f"prompts:count:{filter_cache_key(filter_params)}"
+        total = response_cache.get(key)
+        if total is None:
+            versions = response_cache.tag_versions([PROMPTS_TAG])
+            total = db.query(func.count(Prompt.id)).filter(*conditions).scalar()
+            response_cache.set(
+                key, total, tags=[PROMPTS_TAG], ttl_seconds=settings.PROMPT_COUNT_CACHE_TTL_SECONDS,
+                versions=versions,
+            )
+        return total, True
+
+    return db.query(func.count(Prompt.id)).filter(*conditions).scalar(), True
+
+def listing_cache_key(filter_params: PromptFilter) -> str:
+    """Normalized key for one page of a listing: the filtered set plus sorting and paging"""
+    paging = filter_params.model_dump(
+        include={
+            "sort_by", "sort_order", "page", "page_size", "cursor",
+            "count_strategy", "view", "include_facets",
+        }
+    )
+    return f"{filter_cache_key(filter_params)}:{json.dumps(paging, sort_keys=True)}"
+
+def invalidate_prompt_caches(prompt_id: Optional[int] = None) -> None:
+    """Drop cached listings and counts, and the detail entry of `prompt_id`, after a write"""
+    tags = [PROMPTS_TAG]
+    if prompt_id is not None:
+        tags.append(prompt_tag(prompt_id))
+    response_cache.invalidate_tags(*tags)
+
+def _sync_category_counts(
+    db: Session,
+    old_category_id: Optional[int],
+    old_is_active: bool,
+    new_category_id: Optional[int],
+    new_is_active: bool,
+) -> bool:
+    """Move a prompt's contribution to Category.prompts_count; returns True if anything changed"""
+    old = (old_category_id, bool(old_is_active))
+    new = (new_category_id, bool(new_is_active))
+    if old == new:
+        return False
+    if old[0] is not None and old[1]:
+        adjust_prompts_count(db, old[0], -1)
+    if new[0] is not None and new[1]:
+        adjust_prompts_count(db, new[0], 1)
+    return True
+
+def get_prompts(
+    db: Session,
+    filter_params: PromptFilter,
+    user_id: Optional[int] = None,
+) -> PromptPage:
+    """
+    Get prompts with filtering, searching, and pagination.
+    Pages are addressed either by `page` (offset) or by an opaque `cursor`
+    (keyset seek on the sort column plus id). Returns a PromptPage.
+    Raises ValueError for an invalid cursor.
+    """
+    conditions, ts_query = _filter_conditions(filter_params)
+    query = db.query(Prompt).options(*listing_options(filter_params.view)).filter(*conditions)
 
     # Get total count before pagination
-    total_count = query.count()
+    total_count, total_is_exact = count_prompts(db, filter_params, conditions)
+
+    # Apply sorting; id is always the tie-breaker so keyset positions are unique
+    sort_key = None
+    sort_order = "asc" if filter_params.sort_order == "asc" else "desc"
+    if filter_params.sort_by == "relevance" and ts_query is not None:
+        if filter_params.cursor:
+            raise ValueError("Cursor pagination is not supported when sorting by relevance")
+        query = query.order_by(desc(func.ts_rank_cd(Prompt.search_vector, ts_query)), desc(Prompt.id))
+    else:
+        # Column sort, created_at desc by default
+        sort_key = _resolve_sort_key(filter_params.sort_by)
+        sort_column = SORT_COLUMNS[sort_key]
+        direction = asc if sort_order == "asc" else desc
+        query = query.order_by(direction(sort_column), direction(Prompt.id))
 
-    # Apply pagination
-    query = query.offset((filter_params.page - 1) * filter_params.page_size)
-    query = query.limit(filter_params.page_size)
+    # Apply pagination: seek past the cursor position, or fall back to offset
+    if filter_params.cursor:
+        last_value, last_id = decode_cursor(filter_params.cursor, sort_key, sort_order)
+        position = tuple_(SORT_COLUMNS[sort_key], Prompt.id)
+        if sort_order == "asc":
+            query = query.filter(position > tuple_(last_value, last_id))
+        else:
+            query = query.filter(position < tuple_(last_value, last_id))
+    else:
+        query = query.offset((filter_params.page - 1) * filter_params.page_size)
 
-    prompts = query.all()
+    # Fetch one extra row to learn whether another page exists
+    prompts = query.limit(filter_params.page_size + 1).all()
+    next_cursor = None
+    if len(prompts) > filter_params.page_size:
+        prompts = prompts[:filter_params.page_size]
+        if sort_key:
+            next_cursor = encode_cursor(sort_key, sort_order, prompts[-1])
     
-    # If user_id is provided, check which prompts are favorited by the user
-    if user_id and prompts:
-        from app.services.favorite import is_favorited
-        for prompt in prompts:
-            prompt.is_favorited = is_favorited(db, user_id, prompt.id)
+    # If user_id is provided, resolve the viewer's flags for the whole page at once
+    if user_id:
+        ViewerStateLoader(db, user_id).apply(prompts)
     
-    return prompts, total_count
+    return PromptPage(prompts, total_count, next_cursor, total_is_exact)
+
+def get_prompt_facets(db: Session, filter_params: PromptFilter) -> dict:
+    """
+    Facet counts (category, price bucket, featured, sequence, rating band) over
+    the filtered set, computed in one GROUPING SETS aggregate and cached per filter.
+    """
+    cache_key = f"prompts:facets:{filter_cache_key(filter_params)}"
+    facets = response_cache.get(cache_key)
+    if facets is not None:
+        return facets
+
+    versions = response_cache.tag_versions([PROMPTS_TAG])
+    conditions, _ = _filter_conditions(filter_params)
+    price_bucket = case(
+        *[(Prompt.price < edge, index) for index, edge in enumerate(PRICE_BUCKET_EDGES)],
+        else_=len(PRICE_BUCKET_EDGES),
+    )
+    # 1-star band is [0, 2), then [2, 3), [3, 4), [4, 5]
+    rating_band = case(
+        (Prompt.rating >= 4, 4),
+        (Prompt.rating >= 3, 3),
+        (Prompt.rating >= 2, 2),
+        else_=1,
+    )
+    dimensions = {
+        "category_id": Prompt.category_id,
+        "price_bucket": price_bucket,
+        "is_featured": Prompt.is_featured,
+        "is_sequence": Prompt.is_sequence,
+        "rating_band": rating_band,
+    }
+
+    stmt = (
+        select(
+            *[expr.label(name) for name, expr in dimensions.items()],
+            *[func.grouping(expr).label(f"grouping_{name}") for name, expr in dimensions.items()],
+            func.count().label("count"),
+        )
+        .where(*conditions)
+        .group_by(func.grouping_sets(*[tuple_(expr) for expr in dimensions.values()]))
+    )
+
+    buckets = {name: {} for name in dimensions}
+    for row in db.execute(stmt).mappings():
+        # GROUPING(x) = 0 marks the grouping set this row belongs to
+        name = next(name for name in dimensions if row[f"grouping_{name}"] == 0)
+        value = row[name]
+        if name in ("is_featured", "is_sequence"):
+            # Nullable flags: NULL counts as False
+            value = bool(value)
+        buckets[name][value] = buckets[name].get(value, 0) + row["count"]
+
+    price_edges = (0,) + PRICE_BUCKET_EDGES + (None,)
+    facets = {
+        "categories": [
+            {"category_id": category_id, "count": count}
+            for category_id, count in sorted(buckets["category_id"].items(), key=lambda item: -item[1])
+        ],
+        "price_buckets": [
+            {"min_price": price_edges[index], "max_price": price_edges[index + 1], "count": count}
+            for index, count in sorted(buckets["price_bucket"].items())
+        ],
+        "featured": [
+            {"value": value, "count": count} for value, count in buckets["is_featured"].items()
+        ],
+        "sequence": [
+            {"value": value, "count": count} for value, count in buckets["is_sequence"].items()
+        ],
+        "rating_bands": [
+            {"min_rating": band, "count": count} for band, count in sorted(buckets["rating_band"].items())
+        ],
+    }
+    response_cache.set(cache_key, facets, tags=[PROMPTS_TAG], versions=versions)
+    return facets
 
 def get_prompt(db: Session, prompt_id: int, user_id: Optional[int] = None) -> Optional[Prompt]:
     """Get a single prompt by ID"""
     prompt = db.query(Prompt).options(joinedload(Prompt.seller)).filter(Prompt.id == prompt_id).first()
     
-    # If user_id is provided, check if the prompt is favorited by the user
+    # If user_id is provided, resolve the viewer's flags for this prompt
     if prompt and user_id:
-        from app.services.favorite import is_favorited
-        prompt.is_favorited = is_favorited(db, user_id, prompt_id)
+        ViewerStateLoader(db, user_id).apply([prompt])
     
     return prompt
 
-def increment_views(db: Session, prompt_id: int) -> None:
-    """Increment the views count of a prompt"""
-    prompt = get_prompt(db, prompt_id)
-    if prompt:
-        prompt.views_count += 1
-        db.commit()
+def increment_views(prompt_id: int) -> None:
+    """Record a view of a prompt; counts are written in batches by the view buffer"""
+    view_buffer.increment(prompt_id)
 
 def create_prompt(
     db: Session,
@@ -101,8 +390,12 @@ def create_prompt(
         rating=0.0,
     )
     db.add(db_prompt)
+    adjust_prompts_count(db, db_prompt.category_id, 1)
     db.commit()
     db.refresh(db_prompt)
+    invalidate_prompt_caches(db_prompt.id)
+    response_cache.invalidate_tags(CATEGORIES_TAG)
+    primary_pins.pin(seller_id)
     return db_prompt
 
 def update_prompt(
@@ -120,12 +413,20 @@ def update_prompt(
     if prompt.seller_id != seller_id:
         return None
     
+    old_category_id, old_is_active = prompt.category_id, prompt.is_active
     update_data = prompt_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(prompt, field, value)
     
+    counts_changed = _sync_category_counts(
+        db, old_category_id, old_is_active, prompt.category_id, prompt.is_active
+    )
     db.commit()
     db.refresh(prompt)
+    invalidate_prompt_caches(prompt_id)
+    if counts_changed:
+        response_cache.invalidate_tags(CATEGORIES_TAG)
+    primary_pins.pin(seller_id)
     return prompt
 
 def delete_prompt(
@@ -142,8 +443,15 @@ def delete_prompt(
     if prompt.seller_id != seller_id:
         return False
     
+    counts_changed = _sync_category_counts(
+        db, prompt.category_id, prompt.is_active, prompt.category_id, False
+    )
     prompt.is_active = False
     db.commit()
+    invalidate_prompt_caches(prompt_id)
+    if counts_changed:
+        response_cache.invalidate_tags(CATEGORIES_TAG)
+    primary_pins.pin(seller_id)
     return True
 
 def get_user_prompts(
@@ -151,13 +459,16 @@ def get_user_prompts(
     seller_id: int,
     skip: int = 0,
     limit: int = 100,
+    user_id: Optional[int] = None,
+    view: Optional[str] = "summary",
 ) -> List[Prompt]:
-    """Get all prompts created by a user"""
-    return (
+    """Get all prompts created by a user, with viewer flags when user_id is given"""
+    prompts = (
         db.query(Prompt)
-        .options(joinedload(Prompt.seller))
+        .options(*listing_options(view))
         .filter(Prompt.seller_id == seller_id)
         .offset(skip)
         .limit(limit)
         .all()
-    ) 
\ No newline at end of file
+    )
+    return ViewerStateLoader(db, user_id).apply(prompts) 
\ No newline at end of file
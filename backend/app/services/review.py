@@ -1,22 +1,26 @@
+import math
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
 
+from app.db.routing import primary_pins
 from app.models.review import Review
 from app.models.order import Order
 from app.models.prompt import Prompt
 from app.schemas.review import ReviewCreate, ReviewUpdate
 from app.models.enums import OrderStatus
+from app.services.prompt import invalidate_prompt_caches
 
 
 def has_purchased_prompt(db: Session, user_id: int, prompt_id: int) -> bool:
     """
-    Check if a user has purchased a prompt (has a completed order)
+    Check if a user has purchased a prompt (has a paid order)
     """
     order = db.query(Order).filter(
         Order.user_id == user_id,
         Order.prompt_id == prompt_id,
-        Order.status == OrderStatus.COMPLETED
+        Order.status == OrderStatus.PAID
     ).first()
     
     return order is not None
@@ -26,7 +30,14 @@ def get_reviews_for_prompt(db: Session, prompt_id: int, skip: int = 0, limit: in
     """
     Get all reviews for a specific prompt
     """
-    return db.query(Review).filter(Review.prompt_id == prompt_id).offset(skip).limit(limit).all()
+    return (
+        db.query(Review)
+        .options(joinedload(Review.user))
+        .filter(Review.prompt_id == prompt_id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
 
 
 def get_user_review_for_prompt(db: Session, user_id: int, prompt_id: int) -> Optional[Review]:
@@ -73,11 +84,11 @@ def create_review(db: Session, review: ReviewCreate, user_id: int) -> Review:
     )
     
     db.add(db_review)
+    apply_rating_change(db, review.prompt_id, new_rating=db_review.rating)
     db.commit()
     db.refresh(db_review)
-    
-    # Update prompt's average rating
-    update_prompt_rating(db, review.prompt_id)
+    invalidate_prompt_caches(review.prompt_id)
+    primary_pins.pin(user_id)
     
     return db_review
 
@@ -97,15 +108,17 @@ def update_review(db: Session, review_id: int, review_update: ReviewUpdate, user
             detail="You don't have permission to update this review"
         )
     
+    old_rating = db_review.rating
     update_data = review_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_review, field, value)
     
+    if db_review.rating != old_rating:
+        apply_rating_change(db, db_review.prompt_id, old_rating=old_rating, new_rating=db_review.rating)
     db.commit()
     db.refresh(db_review)
-    
-    # Update prompt's average rating
-    update_prompt_rating(db, db_review.prompt_id)
+    invalidate_prompt_caches(db_review.prompt_id)
+    primary_pins.pin(user_id)
     
     return db_review
 
@@ -128,35 +141,83 @@ def delete_review(db: Session, review_id: int, user_id: int) -> bool:
     prompt_id = db_review.prompt_id
     
     db.delete(db_review)
+    apply_rating_change(db, prompt_id, old_rating=db_review.rating)
     db.commit()
-    
-    # Update prompt's average rating
-    update_prompt_rating(db, prompt_id)
+    invalidate_prompt_caches(prompt_id)
+    primary_pins.pin(user_id)
     
     return True
 
 
+def rating_star(rating: float) -> int:
+    """Histogram bucket of a review rating: whole stars, rounded down, within 1-5"""
+    return min(max(math.floor(rating), 1), 5)
+
+
+def apply_rating_change(
+    db: Session,
+    prompt_id: int,
+    old_rating: Optional[float] = None,
+    new_rating: Optional[float] = None,
+) -> None:
+    """
+    Move a prompt's rating aggregates from `old_rating` to `new_rating` (None for
+    a review being created or deleted) with a single atomic UPDATE. Runs in the
+    caller's transaction so the aggregates commit together with the review write.
+    """
+    sum_delta = (new_rating or 0.0) - (old_rating or 0.0)
+    count_delta = (new_rating is not None) - (old_rating is not None)
+
+    star_deltas = {}
+    if old_rating is not None:
+        star = rating_star(old_rating)
+        star_deltas[star] = star_deltas.get(star, 0) - 1
+    if new_rating is not None:
+        star = rating_star(new_rating)
+        star_deltas[star] = star_deltas.get(star, 0) + 1
+
+    # SET expressions see the pre-update row, so the average is computed from the new totals here
+    new_count = Prompt.rating_count + count_delta
+    values = {
+        "rating_sum": Prompt.rating_sum + sum_delta,
+        "rating_count": new_count,
+        "rating": case(
+            (new_count > 0, (Prompt.rating_sum + sum_delta) / new_count),
+            else_=0.0,
+        ),
+    }
+    for star, delta in star_deltas.items():
+        if delta:
+            column = getattr(Prompt, f"rating_{star}_count")
+            values[column.key] = column + delta
+
+    db.execute(
+        update(Prompt).where(Prompt.id == prompt_id).values(**values),
+        execution_options={"synchronize_session": False},
+    )
+
+
 def update_prompt_rating(db: Session, prompt_id: int) -> None:
     """
-    Update a prompt's average rating based on its reviews
+    Rebuild a prompt's rating aggregates from its reviews with one aggregate query.
+    Repair path only; review writes keep the aggregates current via apply_rating_change.
     """
-    # Get all reviews for this prompt
-    reviews = db.query(Review).filter(Review.prompt_id == prompt_id).all()
-    
-    if not reviews:
-        # If no reviews, set rating to 0
-        prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
-        if prompt:
-            prompt.rating = 0.0
-            db.commit()
-        return
-    
-    # Calculate average rating
-    total_rating = sum(review.rating for review in reviews)
-    avg_rating = total_rating / len(reviews)
-    
-    # Update prompt rating
-    prompt = db.query(Prompt).filter(Prompt.id == prompt_id).first()
-    if prompt:
-        prompt.rating = avg_rating
-        db.commit()
+    star = func.least(func.greatest(func.floor(Review.rating), 1), 5)
+    totals = db.query(
+        func.coalesce(func.sum(Review.rating), 0.0),
+        func.count(Review.id),
+        *[func.count(case((star == n, 1))) for n in range(1, 6)],
+    ).filter(Review.prompt_id == prompt_id).one()
+    
+    rating_sum, rating_count, *histogram = totals
+    values = {
+        "rating_sum": rating_sum,
+        "rating_count": rating_count,
+        "rating": rating_sum / rating_count if rating_count else 0.0,
+    }
+    for n, count in enumerate(histogram, start=1):
+        values[f"rating_{n}_count"] = count
+    
+    db.query(Prompt).filter(Prompt.id == prompt_id).update(values, synchronize_session=False)
+    db.commit()
+    invalidate_prompt_caches(prompt_id)
@@ -2,8 +2,9 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_password, verify_and_update_password
 from app.core.config import settings
+from app.services.principal_cache import principal_cache
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
     """Get user by ID"""
@@ -59,6 +60,7 @@ def update_user(
 
     db.commit()
     db.refresh(db_user)
+    principal_cache.invalidate(user_id)
     return db_user
 
 def delete_user(db: Session, user_id: int) -> bool:
@@ -69,6 +71,7 @@ def delete_user(db: Session, user_id: int) -> bool:
     
     db_user.is_active = False
     db.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -76,8 +79,13 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Stored hash used an older cost setting; upgrade it while we have the password
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 def change_password(
@@ -96,6 +104,7 @@ def change_password(
     
     user.hashed_password = get_password_hash(new_password)
     db.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 def deactivate_user(db: Session, user_id: int) -> bool:
@@ -106,6 +115,7 @@ def deactivate_user(db: Session, user_id: int) -> bool:
     
     user.is_active = False
     db.commit()
+    principal_cache.invalidate(user_id)
     return True
 
 def activate_user(db: Session, user_id: int) -> bool:
@@ -116,4 +126,5 @@ def activate_user(db: Session, user_id: int) -> bool:
     
     user.is_active = True
     db.commit()
+    principal_cache.invalidate(user_id)
     return True 
\ No newline at end of file
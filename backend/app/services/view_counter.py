@@ -0,0 +1,133 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import Integer, column, update, values
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.prompt import Prompt
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    Write-behind buffer for prompt view counts.
+
+    Page views only bump an in-memory counter per prompt id; a background
+    thread periodically writes all pending counts in one atomic
+    `UPDATE ... SET views_count = views_count + n` statement. Views recorded
+    since the last flush are lost if the process is killed without shutdown.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.flushed_views = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush_at: Optional[datetime] = None
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def increment(self, prompt_id: int, count: int = 1) -> None:
+        """Record views for a prompt; flushes early once too many prompts are pending"""
+        with self._lock:
+            self._pending[prompt_id] = self._pending.get(prompt_id, 0) + count
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write all pending counts to the database; returns the number of views written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+
+            increments = values(
+                column("id", Integer), column("n", Integer), name="view_increments"
+            ).data(list(batch.items()))
+
+            db = SessionLocal()
+            try:
+                # updated_at is kept as-is: a view is not a change to the prompt itself
+                db.execute(
+                    update(Prompt)
+                    .where(Prompt.id == increments.c.id)
+                    .values(
+                        views_count=Prompt.views_count + increments.c.n,
+                        updated_at=Prompt.updated_at,
+                    ),
+                    execution_options={"synchronize_session": False},
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                self.failed_flushes += 1
+                logger.exception("Failed to flush %d prompt view counts, will retry", len(batch))
+                # Put the batch back so the next flush retries it
+                with self._lock:
+                    for prompt_id, count in batch.items():
+                        self._pending[prompt_id] = self._pending.get(prompt_id, 0) + count
+                return 0
+            finally:
+                db.close()
+
+            written = sum(batch.values())
+            self.flushed_views += written
+            self.flushes += 1
+            self.last_flush_at = datetime.utcnow()
+            return written
+
+    def start(self) -> None:
+        """Start the background flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="view-count-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and write out whatever is still pending"""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer size and flush counters"""
+        with self._lock:
+            pending_prompts = len(self._pending)
+            pending_views = sum(self._pending.values())
+        return {
+            "pending_prompts": pending_prompts,
+            "pending_views": pending_views,
+            "max_pending": self.max_pending,
+            "flushed_views": self.flushed_views,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_at": self.last_flush_at,
+        }
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+            self.flush()
+
+
+view_buffer = ViewCountBuffer(
+    flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.VIEW_COUNT_MAX_PENDING,
+)
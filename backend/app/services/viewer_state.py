@@ -0,0 +1,86 @@
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy.orm import Session
+
+from app.models.enums import OrderStatus
+from app.models.favorite import Favorite
+from app.models.order import Order
+from app.models.prompt import Prompt
+from app.models.review import Review
+
+
+class ViewerStateLoader:
+    """
+    Resolves the current viewer's flags (favorited, purchased, reviewed) for
+    many prompts at once. Each load issues one query per flag no matter how
+    many prompt ids are requested, and results are remembered so the same
+    loader can serve several listings within a request.
+    """
+
+    def __init__(self, db: Session, user_id: Optional[int]):
+        self.db = db
+        self.user_id = user_id
+        self._loaded: Set[int] = set()
+        self._favorited: Set[int] = set()
+        self._purchased: Set[int] = set()
+        self._reviewed: Set[int] = set()
+
+    def load(self, prompt_ids: Iterable[int]) -> None:
+        """Fetch flags for any prompt ids not loaded yet"""
+        missing = set(prompt_ids) - self._loaded
+        if not missing or not self.user_id:
+            return
+
+        favorited = self.db.query(Favorite.prompt_id).filter(
+            Favorite.user_id == self.user_id,
+            Favorite.prompt_id.in_(missing)
+        )
+        purchased = self.db.query(Order.prompt_id).filter(
+            Order.user_id == self.user_id,
+            Order.prompt_id.in_(missing),
+            Order.status == OrderStatus.PAID
+        )
+        reviewed = self.db.query(Review.prompt_id).filter(
+            Review.user_id == self.user_id,
+            Review.prompt_id.in_(missing)
+        )
+
+        self._favorited.update(prompt_id for (prompt_id,) in favorited)
+        self._purchased.update(prompt_id for (prompt_id,) in purchased)
+        self._reviewed.update(prompt_id for (prompt_id,) in reviewed)
+        self._loaded.update(missing)
+
+    def is_favorited(self, prompt_id: int) -> bool:
+        self.load([prompt_id])
+        return prompt_id in self._favorited
+
+    def is_purchased(self, prompt_id: int) -> bool:
+        self.load([prompt_id])
+        return prompt_id in self._purchased
+
+    def is_reviewed(self, prompt_id: int) -> bool:
+        self.load([prompt_id])
+        return prompt_id in self._reviewed
+
+    def apply(self, prompts: List[Prompt]) -> List[Prompt]:
+        """Set is_favorited / is_purchased / is_reviewed on each prompt"""
+        if not self.user_id or not prompts:
+            return prompts
+
+        self.load(prompt.id for prompt in prompts)
+        for prompt in prompts:
+            prompt.is_favorited = prompt.id in self._favorited
+            prompt.is_purchased = prompt.id in self._purchased
+            prompt.is_reviewed = prompt.id in self._reviewed
+        return prompts
+
+    def apply_to_dicts(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Same as apply, for already-serialized prompts (e.g. a cached response)"""
+        if not self.user_id or not items:
+            return items
+
+        self.load(item["id"] for item in items)
+        for item in items:
+            item["is_favorited"] = item["id"] in self._favorited
+            item["is_purchased"] = item["id"] in self._purchased
+            item["is_reviewed"] = item["id"] in self._reviewed
+        return items
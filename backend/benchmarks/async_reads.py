@@ -0,0 +1,87 @@
+"""
+Compare the threadpool and asyncpg read paths under concurrency.
+
+Runs the app in-process through httpx's ASGI transport against the database
+in DATABASE_URL, once with every route on the threadpool and once with the
+routes listed in ASYNC_DB_ROUTES, and prints throughput and latency for each.
+The response cache is disabled so every request reaches Postgres, and the
+AnyIO thread limit can be lowered to make the threadpool ceiling visible.
+
+    python benchmarks/async_reads.py --path /api/v1/prompts/ --concurrency 200 --thread-limit 40
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+import anyio.to_thread
+import httpx
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.main import app
+
+ASYNC_ROUTES = ["prompts.list", "prompts.detail", "categories.list", "reviews.list", "favorites.list"]
+
+
+async def run_round(path: str, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    response_cache.backend = None
+    if args.thread_limit:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = args.thread_limit
+
+    for label, routes in (("threadpool", []), ("asyncpg", ASYNC_ROUTES)):
+        settings.ASYNC_DB_ROUTES = routes
+        # Warm up connections and caches outside the measured round
+        await run_round(args.path, min(args.concurrency, args.requests), args.concurrency)
+        result = await run_round(args.path, args.requests, args.concurrency)
+        print(
+            f"{label:>10}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+            f"p95 {result['p95_ms']:7.1f} ms  max {result['max_ms']:7.1f} ms  errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--path", default=f"{settings.API_V1_STR}/prompts/")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--thread-limit", type=int, default=0, help="Override the AnyIO thread limit (default 40)")
+    asyncio.run(main(parser.parse_args()))
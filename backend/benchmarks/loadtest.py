@@ -0,0 +1,299 @@
+"""
+HTTP load test replaying a realistic traffic mix against a running server.
+
+Virtual users pick scenarios by weight: anonymous browsing and search,
+prompt detail with reviews, login, favorite toggles, checkout (order plus
+payment) and reviews. Accounts, prompts and categories come from the
+database in DATABASE_URL, so seed it first with scripts/seed_bulk.py.
+Prints throughput and p50/p95/p99 latency per route; --save writes the
+results as a JSON baseline and --compare diffs a run against one.
+
+    uvicorn app.main:app --workers 4 &
+    python benchmarks/loadtest.py --duration 60 --concurrency 50 --save baseline.json
+    python benchmarks/loadtest.py --duration 60 --concurrency 50 --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.bulk_seed import SEED_PASSWORD
+from app.db.session import SessionLocal
+
+SEARCH_TERMS = ("blog", "code review", "marketing email", "story", "lesson plan", "logo", "travel", "api")
+SORTS = ("created_at", "price", "rating", "sales_count", "views_count")
+PAYMENT_METHODS = ("momo", "zalopay", "vnpay", "stripe")
+
+
+class Fixtures:
+    """Ids and accounts the scenarios draw from, read once from the database"""
+
+    def __init__(self, accounts: int):
+        db = SessionLocal()
+        try:
+            self.emails = [email for (email,) in db.execute(text(
+                "SELECT email FROM \"user\" WHERE email LIKE '%@seed.example.com' AND is_active "
+                "ORDER BY id LIMIT :limit"
+            ), {"limit": accounts})]
+            self.prompts = [
+                (id, price) for id, price in db.execute(text(
+                    "SELECT id, price FROM prompt WHERE is_active ORDER BY sales_count DESC, id LIMIT 5000"
+                ))
+            ]
+            self.categories = [id for (id,) in db.execute(text("SELECT id FROM category WHERE is_active"))]
+        finally:
+            db.close()
+        if not self.emails or not self.prompts:
+            raise SystemExit("No seeded accounts or prompts found; run scripts/seed_bulk.py first")
+
+
+class Recorder:
+    """Latency samples and status codes per route template"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    def add(self, route: str, seconds: float, status_code: int, expected: tuple) -> None:
+        if not self.recording:
+            return
+        self.latencies[route].append(seconds)
+        self.statuses[route][status_code] += 1
+        if status_code not in expected:
+            self.errors[route] += 1
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples"""
+    index = max(0, min(len(samples) - 1, int(round(fraction * len(samples) + 0.5)) - 1))
+    return samples[index]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, fixtures: Fixtures, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.fixtures = fixtures
+        self.recorder = recorder
+        self.rng = rng
+        self.email = rng.choice(fixtures.emails)
+        self.headers: Optional[Dict[str, str]] = None
+
+    async def request(self, method: str, route: str, url: str, expected: tuple = (200,), **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status_code = response.status_code
+        except httpx.HTTPError:
+            response, status_code = None, 0
+        self.recorder.add(f"{method} {route}", time.perf_counter() - started, status_code, expected)
+        return response
+
+    def prompt(self) -> tuple:
+        # Popular prompts come first in the fixture list; favor them like real traffic does
+        prompts = self.fixtures.prompts
+        return prompts[min(int(self.rng.paretovariate(1.2)) - 1, len(prompts) - 1)]
+
+    async def browse(self) -> None:
+        params = {"page": self.rng.choice((1, 1, 1, 2, 3)), "sort_by": self.rng.choice(SORTS)}
+        if self.fixtures.categories and self.rng.random() < 0.5:
+            params["category_id"] = self.rng.choice(self.fixtures.categories)
+        await self.request("GET", "/prompts/", "/prompts/", params=params)
+
+    async def search(self) -> None:
+        await self.request("GET", "/prompts/", "/prompts/", params={"search": self.rng.choice(SEARCH_TERMS)})
+
+    async def detail(self) -> None:
+        prompt_id, _ = self.prompt()
+        await self.request("GET", "/prompts/{prompt_id}", f"/prompts/{prompt_id}", headers=self.headers)
+        await self.request("GET", "/reviews/prompt/{prompt_id}", f"/reviews/prompt/{prompt_id}")
+
+    async def categories(self) -> None:
+        await self.request("GET", "/categories/", "/categories/")
+
+    async def login(self) -> None:
+        response = await self.request(
+            "POST", "/auth/login", "/auth/login", json={"email": self.email, "password": SEED_PASSWORD}
+        )
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def ensure_login(self) -> bool:
+        if self.headers is None:
+            await self.login()
+        return self.headers is not None
+
+    async def favorite(self) -> None:
+        if not await self.ensure_login():
+            return
+        prompt_id, _ = self.prompt()
+        url = f"/favorites/{prompt_id}"
+        await self.request("POST", "/favorites/{prompt_id}", url, expected=(201, 400), headers=self.headers)
+        await self.request("DELETE", "/favorites/{prompt_id}", url, expected=(200, 404), headers=self.headers)
+
+    async def checkout(self) -> None:
+        if not await self.ensure_login():
+            return
+        prompt_id, price = self.prompt()
+        response = await self.request(
+            "POST", "/orders/", "/orders/", expected=(201,), headers=self.headers,
+            json={"amount": price, "prompt_id": prompt_id},
+        )
+        if response is None or response.status_code != 201:
+            return
+        order_id = response.json()["id"]
+        await self.request(
+            "POST", "/orders/{order_id}/payments", f"/orders/{order_id}/payments", expected=(201,),
+            headers=self.headers, json={"method": self.rng.choice(PAYMENT_METHODS)},
+        )
+
+    async def review(self) -> None:
+        if not await self.ensure_login():
+            return
+        response = await self.request("GET", "/orders/", "/orders/", headers=self.headers)
+        if response is None or response.status_code != 200:
+            return
+        paid = [order["prompt_id"] for order in response.json() if order["status"] == "paid"]
+        if not paid:
+            return
+        # Most buyers reviewed already; a 400 for a duplicate review is an expected outcome
+        await self.request(
+            "POST", "/reviews/", "/reviews/", expected=(201, 400), headers=self.headers,
+            json={"prompt_id": self.rng.choice(paid), "rating": self.rng.choice((3, 4, 5)), "comment": "Load test"},
+        )
+
+    def scenarios(self) -> List[tuple]:
+        """(scenario, weight) pairs; reads dominate as on the live site"""
+        return [
+            (self.browse, 35), (self.search, 15), (self.detail, 20), (self.categories, 5),
+            (self.login, 5), (self.favorite, 10), (self.checkout, 5), (self.review, 5),
+        ]
+
+    async def run(self, until: Callable[[], bool]) -> None:
+        scenarios, weights = zip(*self.scenarios())
+        while not until():
+            await self.rng.choices(scenarios, weights=weights)[0]()
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for route, samples in sorted(recorder.latencies.items()):
+        samples.sort()
+        routes[route] = {
+            "requests": len(samples),
+            "errors": recorder.errors[route],
+            "rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+            "statuses": {str(code): n for code, n in sorted(recorder.statuses[route].items())},
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {"requests": total, "rps": round(total / elapsed, 2), "routes": routes}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=backend_dir
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(summary: dict) -> None:
+    print(f"\n{summary['requests']} requests, {summary['rps']:.1f} req/s")
+    print(f"{'route':<40} {'reqs':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, stats in summary["routes"].items():
+        print(
+            f"{route:<40} {stats['requests']:>7} {stats['errors']:>5} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}"
+        )
+
+
+def compare(summary: dict, baseline: dict, tolerance: float) -> bool:
+    """Print per-route changes against a baseline; True if any percentile regressed beyond tolerance"""
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline.get('created_at')}):")
+    regressed = False
+    for route, stats in summary["routes"].items():
+        before = baseline["routes"].get(route)
+        if before is None:
+            print(f"{route:<40} new route")
+            continue
+        changes = []
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            change = (stats[key] - before[key]) / before[key] if before[key] else 0.0
+            flag = " !" if change > tolerance else ""
+            regressed = regressed or bool(flag)
+            changes.append(f"{key[:3]} {before[key]:.1f} -> {stats[key]:.1f} ({change:+.0%}){flag}")
+        print(f"{route:<40} " + "  ".join(changes))
+    return regressed
+
+
+async def main(args: argparse.Namespace) -> int:
+    fixtures = Fixtures(args.accounts)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    base_url = args.base_url.rstrip("/") + settings.API_V1_STR
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        users = [
+            VirtualUser(client, fixtures, recorder, random.Random(f"{args.seed}:{index}"))
+            for index in range(args.concurrency)
+        ]
+        started = time.monotonic()
+        deadline = started + args.warmup + args.duration
+
+        async def begin_recording() -> None:
+            await asyncio.sleep(args.warmup)
+            recorder.recording = True
+
+        await asyncio.gather(begin_recording(), *(user.run(lambda: time.monotonic() >= deadline) for user in users))
+
+    summary = summarize(recorder, args.duration)
+    summary.update({
+        "revision": git_revision(),
+        "created_at": datetime.utcnow().isoformat(),
+        "config": {key: getattr(args, key) for key in ("duration", "concurrency", "seed", "accounts")},
+    })
+    print_report(summary)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(summary, indent=2))
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        if compare(summary, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds of load before measuring starts")
+    parser.add_argument("--concurrency", type=int, default=50, help="Virtual users")
+    parser.add_argument("--accounts", type=int, default=500, help="Seeded accounts to log in as")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for each virtual user's scenario sequence")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Diff against a saved JSON baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed percentile increase for --compare")
+    sys.exit(asyncio.run(main(parser.parse_args())))
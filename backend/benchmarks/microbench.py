@@ -0,0 +1,226 @@
+"""
+Microbenchmarks for the service functions that dominate CPU time.
+
+Times listing queries for each filter and sort, PromptInDB / PromptResponse
+serialization of 100 items, token creation and decoding, password
+verification, the rating repair path and order detail loading against the
+database in DATABASE_URL. Results are JSON (per-call median and minimum over
+several rounds); --save-baseline stores them and later runs are compared with
+the baseline, failing when a case is slower by more than --tolerance. A
+missing baseline is an error (exit 2) unless --no-compare is given.
+
+    python scripts/seed_bulk.py --scale 1 --end 2026-01-01
+    python benchmarks/microbench.py --save-baseline
+    python benchmarks/microbench.py --tolerance 0.2
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from jose import jwt
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.hashing import password_hash_pool
+from app.db.bulk_seed import SEED_PASSWORD, BulkSeeder, SeedCounts
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.schemas.prompt import PromptFilter, PromptInDB, PromptResponse
+from app.services import order as order_service
+from app.services import prompt as prompt_service
+from app.services import review as review_service
+
+DEFAULT_BASELINE = backend_dir / "benchmarks" / "baselines" / "microbench.json"
+
+LISTING_FILTERS = {
+    "all": {},
+    "category": {"category_id": "category_id"},
+    "price_range": {"min_price": 5, "max_price": 20},
+    "featured": {"is_featured": True},
+    "search": {"search": "blog post", "search_mode": "fulltext"},
+}
+LISTING_SORTS = ("created_at", "price", "rating", "sales_count", "views_count")
+
+
+def sample_ids(db: Session) -> Dict[str, Any]:
+    """Busy rows, so timings reflect realistic row counts"""
+    row = db.execute(text(
+        """
+        SELECT
+            (SELECT category_id FROM prompt GROUP BY category_id ORDER BY count(*) DESC LIMIT 1) AS category_id,
+            (SELECT prompt_id FROM review GROUP BY prompt_id ORDER BY count(*) DESC LIMIT 1) AS prompt_id,
+            (SELECT max(id) FROM "order") AS order_id,
+            (SELECT id FROM "user" WHERE email LIKE '%@seed.example.com' ORDER BY id LIMIT 1) AS user_id,
+            (SELECT count(*) FROM prompt) AS prompts
+        """
+    )).mappings().one()
+    if not row["prompts"] or row["user_id"] is None:
+        raise SystemExit("Database is not seeded; pass --seed-scale or run scripts/seed_bulk.py")
+    return dict(row)
+
+
+def cases(db: Session, ids: Dict[str, Any]) -> List[Tuple[str, Callable[[], Any]]]:
+    """(name, zero-argument callable) for every benchmark"""
+    benches: List[Tuple[str, Callable[[], Any]]] = []
+
+    def listing(filter_params: PromptFilter) -> Callable[[], Any]:
+        def run() -> Any:
+            response_cache.clear()
+            db.expunge_all()
+            return prompt_service.get_prompts(db, filter_params)
+        return run
+
+    for filter_name, values in LISTING_FILTERS.items():
+        values = {key: ids.get(value, value) for key, value in values.items()}
+        sorts = LISTING_SORTS + (("relevance",) if "search" in values else ())
+        for sort in sorts:
+            filter_params = PromptFilter(sort_by=sort, page_size=20, **values)
+            benches.append((f"get_prompts[{filter_name},{sort}]", listing(filter_params)))
+
+    page = prompt_service.get_prompts(db, PromptFilter(view="full", page_size=100))
+    prompts = page.items
+
+    def serialize_items() -> Any:
+        return [PromptInDB.model_validate(prompt).model_dump(mode="json") for prompt in prompts]
+
+    def serialize_response() -> Any:
+        return PromptResponse(
+            items=[PromptInDB.model_validate(prompt) for prompt in prompts],
+            total=page.total, page=1, page_size=100, total_pages=1,
+        ).model_dump_json()
+
+    benches.append((f"PromptInDB.serialize[{len(prompts)}]", serialize_items))
+    benches.append((f"PromptResponse.serialize[{len(prompts)}]", serialize_response))
+
+    user = db.get(User, ids["user_id"])
+    token = security.create_tokens(user)["access_token"]
+    benches.append(("security.create_tokens", lambda: security.create_tokens(user)))
+    benches.append(("jwt.decode", lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])))
+    benches.append(("security.verify_password", lambda: security.verify_password(SEED_PASSWORD, user.hashed_password)))
+
+    # Repair path: recomputes the aggregates the prompt already has, so reruns leave data unchanged
+    if ids["prompt_id"] is not None:
+        benches.append(("review.update_prompt_rating", lambda: review_service.update_prompt_rating(db, ids["prompt_id"])))
+
+    def order_details() -> Any:
+        db.expunge_all()
+        return order_service.get_order_with_details(db, ids["order_id"])
+
+    if ids["order_id"] is not None:
+        benches.append(("order.get_order_with_details", order_details))
+    return benches
+
+
+def measure(run: Callable[[], Any], rounds: int, min_round_seconds: float) -> Dict[str, float]:
+    """Per-call seconds over `rounds` rounds, each long enough to swamp timer overhead"""
+    run()  # Warm up caches, prepared statements and lazy imports
+    started = time.perf_counter()
+    run()
+    once = max(time.perf_counter() - started, 1e-6)
+    iterations = max(1, int(min_round_seconds / once))
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            run()
+        per_call.append((time.perf_counter() - started) / iterations)
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "min_us": round(min(per_call) * 1e6, 2),
+        "iterations": iterations,
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: dict, tolerance: float) -> List[str]:
+    """Names of cases whose median is slower than the baseline by more than tolerance"""
+    regressions = []
+    for name, stats in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<48} new")
+            continue
+        change = stats["median_us"] / before["median_us"] - 1
+        flag = "REGRESSION" if change > tolerance else ""
+        print(f"{name:<48} {before['median_us']:>12.1f} -> {stats['median_us']:>12.1f} us  {change:+7.1%}  {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        if args.seed_scale:
+            BulkSeeder(db, SeedCounts().scaled(args.seed_scale), seed=args.seed).run()
+        ids = sample_ids(db)
+
+        results: Dict[str, Dict[str, float]] = {}
+        for name, run in cases(db, ids):
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(run, args.rounds, args.min_round_seconds)
+            print(f"{name:<48} {results[name]['median_us']:>12.1f} us", file=sys.stderr)
+    finally:
+        db.close()
+        password_hash_pool.shutdown()
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "dataset": {"prompts": ids["prompts"]},
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"Saved baseline to {baseline_path}", file=sys.stderr)
+        return 0
+    if args.no_compare:
+        return 0
+    if not baseline_path.exists():
+        # Baselines are machine-specific and not committed; a silent pass here would hide every regression
+        print(
+            f"No baseline at {baseline_path}; record one on this machine with --save-baseline "
+            "(or pass --no-compare to only report)",
+            file=sys.stderr,
+        )
+        return 2
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("dataset") != report["dataset"]:
+        print(f"Warning: baseline dataset {baseline.get('dataset')} differs from {report['dataset']}", file=sys.stderr)
+    regressions = compare(results, baseline, args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-round-seconds", type=float, default=0.2, help="Minimum duration of one timed round")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--seed-scale", type=float, default=0, help="Seed SeedCounts() x this many rows first")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for --seed-scale")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--no-compare", action="store_true", help="Only report; don't compare with a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown of the median, e.g. 0.2 = 20%%")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.db.session import SessionLocal
+from app.services.category import recount_prompts
+
+def main():
+    """Rebuild Category.prompts_count from the prompt table."""
+    db = SessionLocal()
+    try:
+        updated = recount_prompts(db)
+        print(f"Recounted prompts for {updated} categories")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
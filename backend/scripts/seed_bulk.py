@@ -0,0 +1,38 @@
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.db.bulk_seed import BulkSeeder, SeedCounts
+from app.db.session import SessionLocal
+
+logging.basicConfig(level=logging.INFO)
+
+def main():
+    """Load a large synthetic dataset (users, prompts, orders, payments, reviews, favorites, usage) for load testing."""
+    defaults = SeedCounts()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    for name, value in vars(defaults).items():
+        parser.add_argument(f"--{name}", type=int, default=value, help=f"Rows to generate (default {value})")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every count, e.g. 10 for ~1M prompts")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed and counts give the same data")
+    parser.add_argument("--days", type=int, default=730, help="History length that timestamps are spread over")
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None,
+                        help="Latest timestamp (ISO date); defaults to today, pass it for byte-identical reruns")
+    args = parser.parse_args()
+
+    counts = SeedCounts(**{name: getattr(args, name) for name in vars(defaults)}).scaled(args.scale)
+    db = SessionLocal()
+    try:
+        BulkSeeder(db, counts, seed=args.seed, days=args.days, end=args.end).run()
+        print(f"Seeded {counts}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
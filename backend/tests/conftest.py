@@ -0,0 +1,29 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make `app` importable when pytest is run from outside the backend directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings require a database URL; unit tests that never touch the database
+# run against in-memory SQLite. Set DATABASE_URL to a migrated PostgreSQL
+# database to also run the tests marked as needing one.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.core.config import settings  # noqa: E402
+
+
+@pytest.fixture
+def postgres_db():
+    """Session on the PostgreSQL database in DATABASE_URL, rolled back afterwards"""
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        pytest.skip("needs a PostgreSQL DATABASE_URL")
+    from app.db.session import SessionLocal
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.close()
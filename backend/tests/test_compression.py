@@ -0,0 +1,58 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.api.middleware import CompressionMiddleware, _accepted_encodings
+
+BODY = b'{"items": []}' * 200
+
+
+async def listing(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": '"abc"'})
+
+
+app = Starlette(routes=[Route("/", listing)])
+app.add_middleware(CompressionMiddleware, minimum_size=100, brotli_quality=4)
+client = TestClient(app)
+
+
+def get(accept_encoding: str):
+    # The test client sends its own Accept-Encoding unless one is given
+    return client.get("/", headers={"Accept-Encoding": accept_encoding})
+
+
+def test_accepted_encodings_parses_q_values():
+    assert _accepted_encodings("gzip, br;q=0.5, deflate;q=0, identity; q=bad") == {
+        "gzip": 1.0, "br": 0.5, "deflate": 0.0, "identity": 0.0,
+    }
+    assert _accepted_encodings("") == {}
+
+
+@pytest.mark.parametrize("accept_encoding, encoding", [
+    ("gzip, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("BR", "br"),
+    ("*", "br"),
+    ("*;q=0, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("identity", None),
+    ("", None),
+])
+def test_encoding_follows_q_values(accept_encoding, encoding):
+    response = get(accept_encoding)
+    assert response.headers.get("content-encoding") == encoding
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br"])
+def test_compressed_response_gets_a_weak_etag(accept_encoding):
+    response = get(accept_encoding)
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_identity_response_keeps_the_strong_etag():
+    assert get("identity").headers["etag"] == '"abc"'
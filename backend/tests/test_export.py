@@ -0,0 +1,83 @@
+import csv
+import io
+from datetime import datetime
+
+import orjson
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.services import export as export_service
+
+ROWS = 2500
+
+
+@pytest.fixture
+def seed_prompts(monkeypatch):
+    """Point the exports at a SQLite prompt table; returns a function inserting n prompts"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE prompt (id INTEGER PRIMARY KEY, title TEXT, description TEXT, content TEXT, price FLOAT, "
+            "category_id INTEGER, seller_id INTEGER, is_featured BOOLEAN, is_sequence BOOLEAN, parent_id INTEGER, "
+            "rating FLOAT, rating_count INTEGER, sales_count INTEGER, views_count INTEGER, is_active BOOLEAN, "
+            "created_at TIMESTAMP, updated_at TIMESTAMP)"
+        )
+    monkeypatch.setattr(export_service, "ReadSessionLocal", sessionmaker(bind=engine))
+
+    def seed(count: int) -> None:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "INSERT INTO prompt VALUES (?, ?, ?, 'paid content', ?, 1, 2, 0, 0, NULL, 4.5, 2, 3, 4, ?, "
+                "'2026-01-02 03:04:05', '2026-01-02 03:04:05')",
+                [(i, f"Prompt {i}", 'Has "quotes", commas\nand lines', i + 0.5, i % 10 != 0) for i in range(1, count + 1)],
+            )
+
+    yield seed
+    engine.dispose()
+
+
+def active_ids(count: int, after_id: int = 0) -> list:
+    return [i for i in range(after_id + 1, count + 1) if i % 10 != 0]
+
+
+def test_ndjson_with_no_rows_is_empty(seed_prompts):
+    assert list(export_service.ndjson_chunks(export_service.catalog_query())) == []
+
+
+def test_csv_with_no_rows_is_just_the_header(seed_prompts):
+    chunks = list(export_service.csv_chunks(export_service.catalog_query()))
+    assert len(chunks) == 1
+    header = next(csv.reader(io.StringIO(chunks[0].decode())))
+    assert header == [column.key for column in export_service.CATALOG_COLUMNS]
+
+
+def test_ndjson_streams_one_chunk_per_batch(seed_prompts):
+    seed_prompts(ROWS)
+    chunks = list(export_service.ndjson_chunks(export_service.catalog_query(), batch_size=1000))
+    records = [orjson.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+    assert len(chunks) == 3
+    assert [record["id"] for record in records] == active_ids(ROWS)
+    assert "content" not in records[0]
+    assert records[0]["created_at"] == "2026-01-02T03:04:05"
+    assert records[0]["description"] == 'Has "quotes", commas\nand lines'
+
+
+def test_csv_streams_every_row_once(seed_prompts):
+    seed_prompts(ROWS)
+    chunks = list(export_service.csv_chunks(export_service.catalog_query(), batch_size=1000))
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+
+    assert len(chunks) == 3
+    assert [int(row["id"]) for row in rows] == active_ids(ROWS)
+    assert rows[0]["description"] == 'Has "quotes", commas\nand lines'
+    assert datetime.fromisoformat(rows[0]["created_at"]) == datetime(2026, 1, 2, 3, 4, 5)
+
+
+def test_export_resumes_after_the_last_id(seed_prompts):
+    seed_prompts(50)
+    chunks = export_service.export_chunks(export_service.catalog_query(after_id=25), "ndjson", batch_size=10)
+    ids = [orjson.loads(line)["id"] for chunk in chunks for line in chunk.splitlines()]
+    assert ids == active_ids(50, after_id=25)
@@ -0,0 +1,57 @@
+import pytest
+from starlette.requests import Request
+
+from app.api.http_cache import cache_headers, cached_entry, conditional_response, etag_for, etag_matches
+
+
+def request_with(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_etag_ignores_key_order_but_not_values():
+    assert etag_for({"a": 1, "b": 2}) == etag_for({"b": 2, "a": 1})
+    assert etag_for({"a": 1}) != etag_for({"a": 2})
+    assert etag_for({"a": 1}).startswith('"') and etag_for({"a": 1}).endswith('"')
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ('"xyz",W/"abc"', True),
+    ("*", True),
+    ('"abcd"', False),
+    ("abc", False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(request_with(header), '"abc"') is matches
+
+
+def test_matching_etag_gets_304_without_a_body():
+    entry = cached_entry({"id": 1, "title": "t"})
+    response = conditional_response(request_with(entry["etag"]), entry["payload"], entry["etag"], ["prompt:1"])
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == entry["etag"]
+    assert response.headers["surrogate-key"] == "prompt:1"
+
+
+def test_stale_etag_gets_the_payload():
+    entry = cached_entry({"id": 1})
+    response = conditional_response(request_with('"stale"'), entry["payload"], entry["etag"], ["prompt:1"])
+    assert response.status_code == 200
+    assert response.body == b'{"id":1}'
+
+
+def test_personalized_responses_are_private():
+    headers = cache_headers('"abc"', ["prompt:1"], anonymous=False)
+    assert headers["Cache-Control"] == "private, no-cache"
+    assert "Surrogate-Key" not in headers
+    assert headers["Vary"] == "Authorization"
+
+
+def test_missing_payload_has_no_entry():
+    assert cached_entry(None) is None
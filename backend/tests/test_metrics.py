@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from prometheus_client import CollectorRegistry, Counter
+
+from app.api.middleware import UNMATCHED_ROUTE, route_template
+from app.core import metrics
+
+
+def test_totals_are_published_as_counter_increments():
+    registry = CollectorRegistry()
+    counter = Counter("test_lookups", "Lookups", ["result"], registry=registry)
+
+    metrics._publish_total(counter, 5, "hit")
+    metrics._publish_total(counter, 5, "hit")
+    metrics._publish_total(counter, 8, "hit")
+    assert registry.get_sample_value("test_lookups_total", {"result": "hit"}) == 8
+
+    # A source that restarted from zero only moves the baseline; the counter never goes back
+    metrics._publish_total(counter, 2, "hit")
+    metrics._publish_total(counter, 3, "hit")
+    assert registry.get_sample_value("test_lookups_total", {"result": "hit"}) == 9
+
+
+def test_route_template_before_and_after_routing():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        return {}
+
+    def scope(path: str, method: str = "GET", **extra) -> dict:
+        return {"type": "http", "app": app, "method": method, "path": path, "root_path": "", **extra}
+
+    assert route_template(scope("/items/1")) == "/items/{item_id}"
+    assert route_template(scope("/items/1", endpoint=read_item)) == "/items/{item_id}"
+    assert route_template(scope("/items/1", method="DELETE")) == "/items/{item_id}"
+    assert route_template(scope("/nowhere")) == UNMATCHED_ROUTE
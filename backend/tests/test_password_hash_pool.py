@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.hashing import MAX_BLOCKED_THREADS, HashPoolSaturated, PasswordHashPool
+
+
+def wait_for(condition, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def pool():
+    pools = []
+
+    def make(**kwargs) -> PasswordHashPool:
+        pools.append(PasswordHashPool(**kwargs))
+        return pools[-1]
+
+    yield make
+    for created in pools:
+        created.shutdown()
+
+
+def test_without_workers_jobs_run_inline(pool):
+    hash_pool = pool(workers=0, max_pending=0, timeout=1)
+    assert hash_pool._run(sum, [1, 2, 3]) == 6
+    assert hash_pool.stats()["in_flight"] == 0
+
+
+def warm_up(hash_pool: PasswordHashPool) -> None:
+    """Start the worker process, so later timings don't include its startup"""
+    hash_pool._run(abs, -1)
+    wait_for(lambda: hash_pool.stats()["in_flight"] == 0)
+
+
+def test_calls_beyond_workers_and_pending_are_rejected(pool):
+    hash_pool = pool(workers=1, max_pending=0, timeout=30)
+    warm_up(hash_pool)
+    running = threading.Thread(target=hash_pool._run, args=(time.sleep, 1.0))
+    running.start()
+    wait_for(lambda: hash_pool.stats()["in_flight"] == 1)
+
+    with pytest.raises(HashPoolSaturated):
+        hash_pool._run(abs, -1)
+    running.join()
+
+    # Slots are released by the future's done callback, which may trail result()
+    wait_for(lambda: hash_pool.stats()["in_flight"] == 0)
+    stats = hash_pool.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+
+
+def test_timed_out_job_keeps_its_slot_until_it_finishes(pool):
+    hash_pool = pool(workers=1, max_pending=0, timeout=30)
+    warm_up(hash_pool)
+    hash_pool.timeout = 0.2
+
+    with pytest.raises(HashPoolSaturated, match="timed out"):
+        hash_pool._run(time.sleep, 1.0)
+    stats = hash_pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["in_flight"] == 1
+    assert stats["completed"] == 1
+
+    # The worker is still busy with the abandoned job, so the bound still applies
+    with pytest.raises(HashPoolSaturated):
+        hash_pool._run(abs, -1)
+    assert hash_pool.stats()["rejected"] == 1
+
+    wait_for(lambda: hash_pool.stats()["in_flight"] == 0)
+    assert hash_pool.stats()["completed"] == 2
+
+
+def test_pending_jobs_are_capped_below_the_request_threadpool(pool):
+    hash_pool = pool(workers=2, max_pending=100, timeout=1)
+    assert hash_pool.capacity == MAX_BLOCKED_THREADS
+
+
+def test_other_routes_get_threads_while_the_pool_is_saturated(pool):
+    hash_pool = pool(workers=1, max_pending=100, timeout=30)
+    warm_up(hash_pool)
+    hash_pool.timeout = 1.5
+
+    app = FastAPI()
+
+    @app.post("/login")
+    def login():
+        try:
+            hash_pool._run(time.sleep, 2.0)
+        except HashPoolSaturated:
+            return {"status": "busy"}
+        return {"status": "ok"}
+
+    @app.get("/prompts")
+    def prompts():
+        time.sleep(0.3)
+        return []
+
+    async def run() -> float:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            logins = [asyncio.create_task(client.post("/login")) for _ in range(40)]
+            while hash_pool.stats()["in_flight"] < MAX_BLOCKED_THREADS:
+                await asyncio.sleep(0.01)
+
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(client.get("/prompts") for _ in range(20)))
+            elapsed = time.perf_counter() - started
+            assert all(response.status_code == 200 for response in responses)
+            await asyncio.gather(*logins)
+        return elapsed
+
+    # Had the waiting logins taken every thread, the listings would queue until they time out
+    assert asyncio.run(run()) < 1.0
@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.db import routing
+from app.db.routing import PrimaryPins
+
+
+@pytest.fixture
+def with_replicas(monkeypatch):
+    """Pins are only kept while replicas are configured"""
+    monkeypatch.setattr(routing, "replicas", object())
+
+
+def test_pins_are_ignored_without_replicas(monkeypatch):
+    monkeypatch.setattr(routing, "replicas", None)
+    pins = PrimaryPins(pin_seconds=60)
+    pins.pin(1)
+    assert not pins.is_pinned(1)
+
+
+def test_pinned_user_reads_from_the_primary(with_replicas):
+    pins = PrimaryPins(pin_seconds=60)
+    pins.pin(1)
+    assert pins.is_pinned(1)
+    assert not pins.is_pinned(2)
+    assert not pins.is_pinned(None)
+    assert not pins.shared
+
+
+def test_pin_expires_after_the_window(with_replicas):
+    pins = PrimaryPins(pin_seconds=0.05)
+    pins.pin(1)
+    time.sleep(0.1)
+    assert not pins.is_pinned(1)
+
+
+def test_redis_pins_are_shared_between_instances(with_replicas):
+    redis_url = settings.REPLICA_PIN_REDIS_URL or settings.RESPONSE_CACHE_URL
+    if not redis_url:
+        pytest.skip("needs REPLICA_PIN_REDIS_URL or RESPONSE_CACHE_URL")
+    pytest.importorskip("redis")
+    # Two instances stand in for two workers
+    writer = PrimaryPins(pin_seconds=5, redis_url=redis_url, prefix="test:primary-pin:")
+    reader = PrimaryPins(pin_seconds=5, redis_url=redis_url, prefix="test:primary-pin:")
+    writer.pin(424242)
+    assert reader.shared and reader.is_pinned(424242)
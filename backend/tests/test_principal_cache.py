@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.schemas.user import UserUpdate
+from app.services import user as user_service
+from app.services.principal_cache import PrincipalCache
+
+ISSUED_AT = 1700000000
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PrincipalCache(max_entries=100, ttl_seconds=60)
+    monkeypatch.setattr(user_service, "principal_cache", cache)
+    # Hashing is not under test; keep it out of the process pool
+    monkeypatch.setattr(user_service, "get_password_hash", lambda password: f"hashed:{password}")
+    monkeypatch.setattr(user_service, "verify_password", lambda password, hashed: hashed == f"hashed:{password}")
+    return cache
+
+
+@pytest.fixture
+def db():
+    """SQLite session with a single user"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            'CREATE TABLE "user" (id INTEGER PRIMARY KEY, email TEXT, username TEXT, hashed_password TEXT, '
+            "full_name TEXT, role TEXT, is_active BOOLEAN, is_verified BOOLEAN, wallet_address TEXT, "
+            "created_at TIMESTAMP, updated_at TIMESTAMP)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO \"user\" VALUES (1, 'ada@example.com', 'ada', 'hashed:secret', 'Ada', 'USER', 1, 0, NULL, "
+            "NULL, NULL)"
+        )
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_snapshot_is_served_from_the_cache(cache, db):
+    assert cache.get_user(db, 1, ISSUED_AT).full_name == "Ada"
+    db.connection().exec_driver_sql("UPDATE \"user\" SET full_name = 'Changed behind the cache'")
+    assert cache.get_user(db, 1, ISSUED_AT).full_name == "Ada"
+    assert cache.stats()["hits"] == 1
+
+
+def test_password_hash_is_never_cached(cache, db):
+    user = cache.get_user(db, 1, ISSUED_AT)
+    assert user.hashed_password is None
+    assert all("hashed_password" not in columns for _, columns in cache._cache._entries.values())
+
+
+def test_update_user_replaces_the_snapshot(cache, db):
+    cache.get_user(db, 1, ISSUED_AT)
+    user_service.update_user(db, 1, UserUpdate(full_name="Ada Lovelace"))
+    assert cache.get_user(db, 1, ISSUED_AT).full_name == "Ada Lovelace"
+
+
+def test_deactivate_user_replaces_the_snapshot(cache, db):
+    assert cache.get_user(db, 1, ISSUED_AT).is_active
+    assert user_service.deactivate_user(db, 1)
+    assert not cache.get_user(db, 1, ISSUED_AT).is_active
+
+
+def test_change_password_replaces_the_snapshot(cache, db):
+    before = cache.get_user(db, 1, ISSUED_AT)
+    db.connection().exec_driver_sql("UPDATE \"user\" SET full_name = 'Renamed'")
+    assert user_service.change_password(db, 1, "secret", "new secret")
+
+    after = cache.get_user(db, 1, ISSUED_AT)
+    assert (before.full_name, after.full_name) == ("Ada", "Renamed")
+    assert after.hashed_password is None
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg, psycopg2
+
+from app.core.config import settings
+from app.db.explain import Explain
+from app.models.prompt import Prompt
+from app.schemas.prompt import PromptFilter
+from app.services import prompt as prompt_service
+
+ESTIMATE_FILTER = PromptFilter(
+    min_price=1, search="blog post", search_mode="fulltext", count_strategy="estimate"
+)
+
+
+@pytest.mark.parametrize("dialect, placeholder", [
+    (psycopg2.dialect(), "%(price_1)s"),
+    (asyncpg.dialect(), "$1"),
+])
+def test_explain_uses_the_driver_paramstyle(dialect, placeholder):
+    conditions, _ = prompt_service._filter_conditions(ESTIMATE_FILTER)
+    compiled = Explain(select(Prompt.id).where(*conditions)).compile(dialect=dialect)
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT prompt.id")
+    assert placeholder in str(compiled)
+
+
+def test_estimate_count_on_sync_session(postgres_db, monkeypatch):
+    monkeypatch.setattr(settings, "PROMPT_COUNT_ESTIMATE_THRESHOLD", 0)
+    conditions, _ = prompt_service._filter_conditions(ESTIMATE_FILTER)
+    total, is_exact = prompt_service.count_prompts(postgres_db, ESTIMATE_FILTER, conditions)
+    assert total >= 0 and not is_exact
+
+
+def test_estimate_count_on_async_session(postgres_db, monkeypatch):
+    from app.db.session import AsyncSessionLocal, dispose_async_engine, get_async_engine
+
+    monkeypatch.setattr(settings, "PROMPT_COUNT_ESTIMATE_THRESHOLD", 0)
+    conditions, _ = prompt_service._filter_conditions(ESTIMATE_FILTER)
+
+    async def run():
+        get_async_engine()
+        try:
+            async with AsyncSessionLocal() as db:
+                return await db.run_sync(prompt_service.count_prompts, ESTIMATE_FILTER, conditions)
+        finally:
+            await dispose_async_engine()
+
+    total, is_exact = asyncio.run(run())
+    assert total >= 0 and not is_exact
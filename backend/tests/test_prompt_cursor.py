@@ -0,0 +1,89 @@
+import base64
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.schemas.prompt import PromptFilter
+from app.services.prompt import decode_cursor, encode_cursor, get_prompts
+
+
+@pytest.fixture
+def db():
+    """SQLite session with the columns a summary listing loads, NOT NULL like the migrated schema"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql('CREATE TABLE "user" (id INTEGER PRIMARY KEY, username TEXT, full_name TEXT)')
+        conn.exec_driver_sql(
+            "CREATE TABLE prompt (id INTEGER PRIMARY KEY, title TEXT, description TEXT, price FLOAT, "
+            "category_id INTEGER, seller_id INTEGER, is_active BOOLEAN, is_featured BOOLEAN, is_sequence BOOLEAN, "
+            "views_count INTEGER NOT NULL DEFAULT 0, sales_count INTEGER NOT NULL DEFAULT 0, "
+            "rating FLOAT NOT NULL DEFAULT 0, rating_count INTEGER NOT NULL DEFAULT 0, "
+            "created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP)"
+        )
+        conn.exec_driver_sql("INSERT INTO \"user\" VALUES (1, 'seller', 'Seller')")
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_cursor_round_trips_numeric_sort_value():
+    cursor = encode_cursor("price", "asc", SimpleNamespace(id=7, price=12.5))
+    assert decode_cursor(cursor, "price", "asc") == (12.5, 7)
+
+
+def test_cursor_round_trips_datetime_sort_value():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678)
+    cursor = encode_cursor("created_at", "desc", SimpleNamespace(id=3, created_at=created_at))
+    assert decode_cursor(cursor, "created_at", "desc") == (created_at, 3)
+
+
+def test_cursor_at_null_sort_value_is_refused():
+    with pytest.raises(ValueError, match="NULL rating"):
+        encode_cursor("rating", "desc", SimpleNamespace(id=9, rating=None))
+
+
+def test_cursor_with_null_sort_value_is_rejected():
+    # Issued before the sort columns became NOT NULL
+    cursor = base64.urlsafe_b64encode(b'{"k":"rating","o":"desc","v":null,"id":9}').decode().rstrip("=")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "rating", "desc")
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("price", "desc", SimpleNamespace(id=1, price=99.99))
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("sort_key, sort_order", [("rating", "asc"), ("price", "desc")])
+def test_cursor_for_another_sort_is_rejected(sort_key, sort_order):
+    cursor = encode_cursor("price", "asc", SimpleNamespace(id=1, price=5.0))
+    with pytest.raises(ValueError, match="does not match"):
+        decode_cursor(cursor, sort_key, sort_order)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "eyJrIjoicHJpY2UifQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor, "price", "asc")
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_cursor_pages_past_prompts_without_a_rating(db, sort_order):
+    # Prompts 2, 4 and 5 are inserted without a rating and take the column default
+    insert = "INSERT INTO prompt (id, title, price, category_id, seller_id, is_active{}) VALUES (?, 'p', 1, 1, 1, 1{})"
+    db.connection().exec_driver_sql(insert.format(", rating", ", ?"), [(1, 4.5), (3, 3.0)])
+    db.connection().exec_driver_sql(insert.format("", ""), [(2,), (4,), (5,)])
+    seen, cursor = [], None
+    while True:
+        page = get_prompts(db, PromptFilter(sort_by="rating", sort_order=sort_order, page_size=2, cursor=cursor))
+        seen += [prompt.id for prompt in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = [1, 3, 5, 4, 2] if sort_order == "desc" else [2, 4, 5, 3, 1]
+    assert seen == expected
@@ -0,0 +1,37 @@
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.main import app
+from app.schemas.prompt import PromptFilter
+
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("search_mode", ["substr", "Substring", "full-text", ""])
+def test_unknown_search_mode_is_rejected(search_mode):
+    response = client.get("/api/v1/prompts/", params={"search": "poem", "search_mode": search_mode})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "search_mode"]
+
+    with pytest.raises(ValidationError):
+        PromptFilter(search_mode=search_mode)
+
+
+def test_search_mode_defaults_to_substring():
+    assert PromptFilter(search="poem").search_mode == "substring"
+
+
+@pytest.mark.parametrize("param, value", [
+    ("view", "ful"),
+    ("view", "Summary"),
+    ("count_strategy", "estimated"),
+    ("count_strategy", "EXACT"),
+])
+def test_unknown_view_or_count_strategy_is_rejected(param, value):
+    response = client.get("/api/v1/prompts/", params={param: value})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", param]
+
+    with pytest.raises(ValidationError):
+        PromptFilter(**{param: value})
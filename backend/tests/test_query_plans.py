@@ -0,0 +1,141 @@
+"""
+The hot service queries must be served by indexes. Each one is run against
+the seeded PostgreSQL database in DATABASE_URL, every statement it issues is
+EXPLAINed, and a Seq Scan on a table with QUERY_PLAN_MIN_ROWS or more
+estimated rows fails the test. Seed first (scripts/seed_bulk.py) and set
+QUERY_PLAN_ANALYZE=1 to refresh planner statistics before checking.
+"""
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.schemas.prompt import PromptFilter
+from app.services import favorite as favorite_service
+from app.services import order as order_service
+from app.services import prompt as prompt_service
+from app.services import review as review_service
+
+MIN_ROWS = int(os.environ.get("QUERY_PLAN_MIN_ROWS", "10000"))
+
+# Hot service calls, each given a session and sample ids from the database.
+# Listings use the estimate count strategy, as a full exact COUNT of a large
+# catalog is a scan by design.
+HOT_QUERIES: Dict[str, Callable[[Session, Dict[str, int]], Any]] = {
+    "prompts.list newest": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(count_strategy="estimate"), ids["user_id"]),
+    "prompts.list by category": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(category_id=ids["category_id"], count_strategy="estimate"), ids["user_id"]),
+    "prompts.list by price": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(sort_by="price", sort_order="asc", count_strategy="estimate")),
+    "prompts.list by rating": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(sort_by="rating", count_strategy="estimate")),
+    "prompts.list by sales": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(sort_by="sales_count", count_strategy="estimate")),
+    "prompts.list by views": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(sort_by="views_count", count_strategy="estimate")),
+    "prompts.search fulltext": lambda db, ids: prompt_service.get_prompts(
+        db, PromptFilter(search="blog post", search_mode="fulltext", sort_by="relevance", count_strategy="estimate")),
+    "prompts.detail": lambda db, ids: prompt_service.get_prompt(db, ids["prompt_id"], ids["user_id"]),
+    "prompts.by_seller": lambda db, ids: prompt_service.get_user_prompts(db, ids["seller_id"], user_id=ids["user_id"]),
+    "favorites.list": lambda db, ids: favorite_service.get_user_favorites(db, ids["user_id"]),
+    "favorites.is_favorited": lambda db, ids: favorite_service.is_favorited(db, ids["user_id"], ids["prompt_id"]),
+    "reviews.list": lambda db, ids: review_service.get_reviews_for_prompt(db, ids["prompt_id"]),
+    "reviews.has_purchased": lambda db, ids: review_service.has_purchased_prompt(db, ids["user_id"], ids["prompt_id"]),
+    "orders.by_user": lambda db, ids: order_service.get_orders_by_user(db, ids["user_id"]),
+}
+
+
+@contextmanager
+def capture_statements(db: Session) -> Iterator[List[Tuple[str, Any]]]:
+    """Collect (statement, parameters) for everything executed on the session's engine"""
+    captured: List[Tuple[str, Any]] = []
+    engine = db.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and not statement.lstrip().upper().startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seq_scans(plan: Dict[str, Any]) -> Iterator[str]:
+    """Relation names of every Seq Scan node in a JSON plan"""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+
+@pytest.fixture(scope="module")
+def db():
+    if not settings.DATABASE_URL.startswith("postgresql"):
+        pytest.skip("needs a seeded PostgreSQL DATABASE_URL")
+    from app.db.session import SessionLocal
+    session = SessionLocal()
+    if os.environ.get("QUERY_PLAN_ANALYZE"):
+        session.execute(text("ANALYZE"))
+        session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="module")
+def large_tables(db) -> Dict[str, int]:
+    """Planner row estimates for tables at or above MIN_ROWS"""
+    rows = db.execute(text(
+        """
+        SELECT c.relname, c.reltuples::bigint
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind = 'r' AND n.nspname = current_schema() AND c.reltuples >= :min_rows
+        """
+    ), {"min_rows": MIN_ROWS})
+    tables = {name: count for name, count in rows}
+    db.rollback()
+    if not tables:
+        pytest.skip(f"no table has {MIN_ROWS}+ rows; seed the database first")
+    return tables
+
+
+@pytest.fixture(scope="module")
+def ids(db) -> Dict[str, int]:
+    """Busy rows to run the checks with, so plans reflect realistic selectivity"""
+    row = db.execute(text(
+        """
+        SELECT
+            (SELECT user_id FROM favorite GROUP BY user_id ORDER BY count(*) DESC LIMIT 1) AS user_id,
+            (SELECT prompt_id FROM review GROUP BY prompt_id ORDER BY count(*) DESC LIMIT 1) AS prompt_id,
+            (SELECT seller_id FROM prompt GROUP BY seller_id ORDER BY count(*) DESC LIMIT 1) AS seller_id,
+            (SELECT category_id FROM prompt GROUP BY category_id ORDER BY count(*) DESC LIMIT 1) AS category_id
+        """
+    )).mappings().one()
+    db.rollback()
+    return {key: value or 1 for key, value in row.items()}
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(name, db, large_tables, ids):
+    response_cache.clear()
+    with capture_statements(db) as statements:
+        HOT_QUERIES[name](db, ids)
+    db.rollback()
+    assert statements, "the service issued no statements"
+
+    problems = []
+    connection = db.connection()
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        for table in seq_scans(plan[0]["Plan"]):
+            if table in large_tables:
+                problems.append(f"Seq Scan on {table} (~{large_tables[table]} rows): {' '.join(statement.split())[:300]}")
+    db.rollback()
+    assert not problems, "\n".join(problems)
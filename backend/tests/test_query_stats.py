@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.db.query_stats import STARTED_KEY, assert_max_queries, count_queries
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+
+def test_count_queries_sees_every_statement(engine):
+    with count_queries() as stats, engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.seconds >= 0
+    assert stats.statements == ["SELECT 1", "SELECT 2"]
+
+
+def test_repeated_statements_are_flagged(engine):
+    with count_queries() as stats, engine.connect() as conn:
+        for value in range(5):
+            conn.execute(text("SELECT :value"), {"value": value})
+        conn.execute(text("SELECT 1"))
+    assert stats.repeated(threshold=5) == [("SELECT ?", 5)]
+    assert stats.repeated(threshold=6) == []
+
+
+def test_assert_max_queries_passes_within_the_limit(engine):
+    with assert_max_queries(2), engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 1"))
+
+
+def test_assert_max_queries_lists_statements_over_the_limit(engine):
+    with pytest.raises(AssertionError, match=r"at most 1 queries, got 3:\n  3x SELECT 1"):
+        with assert_max_queries(1), engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+
+
+def test_failed_statement_leaves_no_start_time_behind(engine):
+    with count_queries() as stats, engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        assert STARTED_KEY not in conn.info
+        conn.execute(text("SELECT 1"))
+    assert stats.count == 1
+
+
+def test_prompt_listing_has_no_n_plus_one(postgres_db):
+    from fastapi.testclient import TestClient
+
+    from app.core.cache import response_cache
+    from app.main import app
+
+    response_cache.clear()
+    with TestClient(app) as client, assert_max_queries(3):
+        response = client.get("/api/v1/prompts/", params={"page_size": 50})
+    assert response.status_code == 200
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.models.prompt import Prompt
+from app.services.review import apply_rating_change, rating_star
+
+STAR_COLUMNS = [f"rating_{star}_count" for star in range(1, 6)]
+
+
+@pytest.fixture
+def db():
+    """SQLite session with just the prompt columns the rating UPDATE touches"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE prompt (id INTEGER PRIMARY KEY, rating FLOAT, rating_sum FLOAT, rating_count INTEGER, "
+            + ", ".join(f"{column} INTEGER" for column in STAR_COLUMNS)
+            + ", updated_at TIMESTAMP)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO prompt VALUES (1, 0, 0, 0, " + ", ".join("0" for _ in STAR_COLUMNS) + ", NULL)"
+        )
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def aggregates(db: Session) -> dict:
+    columns = [Prompt.rating, Prompt.rating_sum, Prompt.rating_count, *(getattr(Prompt, c) for c in STAR_COLUMNS)]
+    row = db.execute(select(*columns).where(Prompt.id == 1)).one()
+    return dict(row._mapping)
+
+
+def expected(ratings: list) -> dict:
+    return {
+        "rating": sum(ratings) / len(ratings) if ratings else 0.0,
+        "rating_sum": float(sum(ratings)),
+        "rating_count": len(ratings),
+        **{column: sum(1 for r in ratings if rating_star(r) == star) for star, column in enumerate(STAR_COLUMNS, 1)},
+    }
+
+
+@pytest.mark.parametrize("rating, star", [(0.5, 1), (1.0, 1), (2.9, 2), (4.99, 4), (5.0, 5)])
+def test_rating_star_buckets(rating, star):
+    assert rating_star(rating) == star
+
+
+def test_create_update_delete_keep_aggregates_consistent(db):
+    apply_rating_change(db, 1, new_rating=4.5)
+    apply_rating_change(db, 1, new_rating=2.0)
+    assert aggregates(db) == pytest.approx(expected([4.5, 2.0]))
+
+    apply_rating_change(db, 1, old_rating=4.5, new_rating=3.0)
+    assert aggregates(db) == pytest.approx(expected([3.0, 2.0]))
+
+    apply_rating_change(db, 1, old_rating=2.0)
+    assert aggregates(db) == pytest.approx(expected([3.0]))
+
+
+def test_deleting_the_last_review_resets_the_average(db):
+    apply_rating_change(db, 1, new_rating=5.0)
+    apply_rating_change(db, 1, old_rating=5.0)
+    assert aggregates(db) == pytest.approx(expected([]))
+
+
+def test_rating_change_within_a_star_leaves_the_histogram(db):
+    apply_rating_change(db, 1, new_rating=4.0)
+    apply_rating_change(db, 1, old_rating=4.0, new_rating=4.5)
+    assert aggregates(db) == pytest.approx(expected([4.5]))
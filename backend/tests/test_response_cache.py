@@ -0,0 +1,65 @@
+from app.core.cache import MemoryCacheBackend, ResponseCache, prompt_tag
+
+
+def make_cache() -> ResponseCache:
+    return ResponseCache(MemoryCacheBackend(max_entries=100, ttl_seconds=60), ttl_seconds=60)
+
+
+def test_get_returns_stored_value():
+    cache = make_cache()
+    cache.set("prompts:list", {"items": [1, 2]}, tags=["prompts"])
+    assert cache.get("prompts:list") == {"items": [1, 2]}
+
+
+def test_invalidating_a_tag_drops_its_entries_only():
+    cache = make_cache()
+    cache.set("prompts:list", [1], tags=["prompts"])
+    cache.set("prompts:detail:1", {"id": 1}, tags=[prompt_tag(1)])
+    cache.set("categories:list", [2], tags=["categories"])
+
+    cache.invalidate_tags("prompts", prompt_tag(1))
+
+    assert cache.get("prompts:list") is None
+    assert cache.get("prompts:detail:1") is None
+    assert cache.get("categories:list") == [2]
+
+
+def test_entry_with_several_tags_is_dropped_by_any_of_them():
+    cache = make_cache()
+    cache.set("prompts:detail:1", {"id": 1}, tags=["prompts", prompt_tag(1)])
+    cache.invalidate_tags(prompt_tag(1))
+    assert cache.get("prompts:detail:1") is None
+
+
+def test_entries_stored_after_invalidation_are_served():
+    cache = make_cache()
+    cache.invalidate_tags("prompts")
+    cache.set("prompts:list", [1], tags=["prompts"])
+    assert cache.get("prompts:list") == [1]
+
+
+def test_write_is_refused_when_invalidated_after_the_snapshot():
+    cache = make_cache()
+    versions = cache.tag_versions(["prompts"])
+    # A write lands between the database read and the cache write
+    cache.invalidate_tags("prompts")
+    cache.set("prompts:list", ["stale"], tags=["prompts"], versions=versions)
+
+    assert cache.get("prompts:list") is None
+    assert cache.stats()["stale_writes"] == 1
+
+
+def test_write_with_unchanged_snapshot_is_stored():
+    cache = make_cache()
+    cache.invalidate_tags("categories")
+    versions = cache.tag_versions(["prompts"])
+    cache.set("prompts:list", [1], tags=["prompts"], versions=versions)
+    assert cache.get("prompts:list") == [1]
+
+
+def test_disabled_cache_misses_and_drops_writes():
+    cache = ResponseCache(None, ttl_seconds=60)
+    assert cache.tag_versions(["prompts"]) is None
+    cache.set("prompts:list", [1], tags=["prompts"])
+    assert cache.get("prompts:list") is None
+    assert cache.stats()["backend"] == "none"
@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.models.prompt import Prompt
+from app.services import view_counter
+from app.services.view_counter import ViewCountBuffer
+
+
+class FailingSession:
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("database unavailable")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_increments_are_aggregated_per_prompt():
+    buffer = ViewCountBuffer(flush_interval=60, max_pending=100)
+    buffer.increment(1)
+    buffer.increment(1)
+    buffer.increment(2, count=3)
+    stats = buffer.stats()
+    assert stats["pending_prompts"] == 2
+    assert stats["pending_views"] == 5
+
+
+def test_flush_with_nothing_pending_writes_nothing():
+    assert ViewCountBuffer(flush_interval=60, max_pending=100).flush() == 0
+
+
+def test_failed_flush_keeps_the_batch_for_the_next_one(monkeypatch):
+    monkeypatch.setattr(view_counter, "SessionLocal", FailingSession)
+    buffer = ViewCountBuffer(flush_interval=60, max_pending=100)
+    buffer.increment(1, count=2)
+
+    assert buffer.flush() == 0
+    buffer.increment(1)
+
+    stats = buffer.stats()
+    assert stats["failed_flushes"] == 1
+    assert stats["flushes"] == 0
+    assert stats["pending_views"] == 3
+
+
+def test_reaching_max_pending_wakes_the_flusher():
+    buffer = ViewCountBuffer(flush_interval=60, max_pending=2)
+    buffer.increment(1)
+    assert not buffer._wake.is_set()
+    buffer.increment(2)
+    assert buffer._wake.is_set()
+
+
+def test_flush_adds_pending_views_to_the_prompt(postgres_db):
+    prompt_id = postgres_db.scalar(select(Prompt.id).limit(1))
+    if prompt_id is None:
+        pytest.skip("no prompts in the database")
+    before = postgres_db.scalar(select(Prompt.views_count).where(Prompt.id == prompt_id))
+    postgres_db.rollback()
+
+    buffer = ViewCountBuffer(flush_interval=60, max_pending=100)
+    buffer.increment(prompt_id, count=3)
+    try:
+        assert buffer.flush() == 3
+        assert postgres_db.scalar(select(Prompt.views_count).where(Prompt.id == prompt_id)) == before + 3
+    finally:
+        postgres_db.execute(
+            update(Prompt).where(Prompt.id == prompt_id).values(views_count=Prompt.views_count - 3)
+        )
+        postgres_db.commit()
@@ -10,10 +10,14 @@ interface Prompt {
   is_active: boolean;
   is_featured: boolean;
   rating: number;
+  rating_count?: number;
+  rating_histogram?: Record<string, number>;
   views_count: number;
   sales_count: number;
   created_at: string;
   is_favorited?: boolean;
+  is_purchased?: boolean;
+  is_reviewed?: boolean;
   payment_type?: string;
   sol_price?: number;
   preview_result?: string;
@@ -38,6 +42,7 @@ interface PromptFilterParams {
   page?: number;
   page_size?: number;
   featured?: boolean;
+  cursor?: string;
 }
 
 interface PromptsResponse {
@@ -46,6 +51,7 @@ interface PromptsResponse {
   page: number;
   page_size: number;
   total_pages: number;
+  next_cursor?: string | null;
 }
 
 interface PromptState {
@@ -59,6 +65,7 @@ interface PromptState {
     page: number;
     pageSize: number;
     totalPages: number;
+    nextCursor: string | null;
   };
   filters: PromptFilterParams;
   
@@ -68,6 +75,7 @@ interface PromptState {
   fetchPromptById: (id: number | string) => Promise<Prompt | null>;
   searchPrompts: (query: string) => Promise<Prompt[]>;
   getFilteredPrompts: (params: PromptFilterParams) => Promise<PromptsResponse>;
+  fetchMorePrompts: () => Promise<Prompt[]>;
   setFilters: (filters: Partial<PromptFilterParams>) => void;
   createPrompt: (promptData: Partial<Prompt>) => Promise<Prompt | null>;
   updatePrompt: (id: number, promptData: Partial<Prompt>) => Promise<Prompt | null>;
@@ -84,7 +92,8 @@ const usePromptStore = create<PromptState>((set, get) => ({
     total: 0,
     page: 1,
     pageSize: 12,
-    totalPages: 0
+    totalPages: 0,
+    nextCursor: null
   },
   filters: {
     page: 1,
@@ -180,7 +189,11 @@ const usePromptStore = create<PromptState>((set, get) => ({
       if (params.min_price) queryParams.append('min_price', params.min_price.toString());
       if (params.max_price) queryParams.append('max_price', params.max_price.toString());
       if (params.featured) queryParams.append('featured', params.featured.toString());
-      queryParams.append('page', (params.page || 1).toString());
+      if (params.cursor) {
+        queryParams.append('cursor', params.cursor);
+      } else {
+        queryParams.append('page', (params.page || 1).toString());
+      }
       queryParams.append('page_size', (params.page_size || 12).toString());
       
       // Fetch data from API
@@ -193,7 +206,8 @@ const usePromptStore = create<PromptState>((set, get) => ({
           total: response.total,
           page: response.page,
           pageSize: response.page_size,
-          totalPages: response.total_pages
+          totalPages: response.total_pages,
+          nextCursor: response.next_cursor ?? null
         },
         filters: { ...get().filters, ...params },
         isLoading: false
@@ -215,6 +229,19 @@ const usePromptStore = create<PromptState>((set, get) => ({
     }
   },
   
+  fetchMorePrompts: async () => {
+    // Infinite scroll: seek to the next page with the cursor from the last response
+    const { nextCursor } = get().pagination;
+    if (!nextCursor) return [];
+
+    const previous = get().prompts;
+    const { cursor: _cursor, page: _page, ...filters } = get().filters;
+    const response = await get().getFilteredPrompts({ ...filters, cursor: nextCursor });
+
+    set({ prompts: [...previous, ...response.items] });
+    return response.items;
+  },
+
   setFilters: (filters: Partial<PromptFilterParams>) => {
     set(state => ({
       filters: { ...state.filters, ...filters }